@@ -0,0 +1,1210 @@
+import collections
+import itertools
+import logging
+import re
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_databases, teardown_databases
+from django.urls import reverse
+
+from tasks.models import Task
+
+# Benchmark scenarios, run with `python manage.py benchmark <name>`.
+# Every run gets a throwaway test database (like the test runner), so
+# scenarios can seed and destroy data freely. A scenario returns a dict of
+# measurements; times are in milliseconds. Scenarios only measure: what
+# the app must do is checked by the test suite (tasks/tests.py).
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@contextmanager
+def isolated_environment():
+    with override_settings(
+        ALLOWED_HOSTS=['*'],
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        # Every request runs in this process
+        CACHE_SINGLE_PROCESS=True,
+        # The load scenario reads query counts from this header
+        SERVER_TIMING=True,
+        AUDIT_LOG={'SYNC': True},
+    ):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        # Per-request log lines would dominate the measurements
+        logging.disable(logging.CRITICAL)
+        try:
+            yield
+        finally:
+            logging.disable(logging.NOTSET)
+            teardown_databases(old_config, verbosity=0)
+
+
+def measure(func, *args, **kwargs):
+    """Run ``func`` once; return (elapsed ms, number of SQL queries)."""
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000, len(queries)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {'count': 0}
+
+    def pick(fraction):
+        return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 3)
+
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'p99_ms': pick(0.99),
+        'max_ms': round(samples[-1], 3),
+    }
+
+
+_user_numbers = itertools.count(1)
+
+
+def make_user(password=None, **fields):
+    user = User(username=f'benchuser{next(_user_numbers):06d}', **fields)
+    if password is None:
+        user.set_unusable_password()
+    else:
+        user.set_password(password)
+    user.save()
+    return user
+
+
+def seed_tasks(owner, count, description='Benchmark task description.'):
+    return Task.objects.bulk_create(
+        [Task(title=f'Task {i}', description=description, owner=owner) for i in range(count)],
+        batch_size=1000,
+    )
+
+
+FIXTURE_PASSWORD = 'Bench-fixture-42!'
+FIXTURE_WORDS = ('report', 'invoice', 'meeting', 'review', 'deploy', 'budget', 'backup', 'release')
+
+
+def seed_fixture(users=10, tasks_per_user=100, audit_rows=1000, batch_size=2000):
+    """
+    Bulk-load ``users`` owners with ``tasks_per_user`` tasks each and
+    ``audit_rows`` AuditLog events; returns the users.
+
+    Every user shares one password hash (FIXTURE_PASSWORD), so seeding costs
+    one hasher run however many users there are. The search index and the
+    stats counters, which bulk_create bypasses, are rebuilt at the end.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    from tasks.models import AuditLog
+    from tasks.search import get_search_backend
+    from tasks.stats import recompute_all
+
+    password = make_password(FIXTURE_PASSWORD)
+    names = [f'benchuser{next(_user_numbers):06d}' for _ in range(users)]
+    User.objects.bulk_create([User(username=name, password=password) for name in names], batch_size=batch_size)
+    owners = list(User.objects.filter(username__in=names).order_by('pk'))
+
+    words = FIXTURE_WORDS
+    batch = []
+    for owner in owners:
+        for i in range(tasks_per_user):
+            batch.append(Task(
+                owner=owner,
+                title=f'{words[i % len(words)].capitalize()} {i}',
+                description=f'Benchmark {words[(i // len(words)) % len(words)]} notes for task {i}.',
+                is_completed=i % 3 == 0,
+            ))
+            if len(batch) >= batch_size:
+                Task.objects.bulk_create(batch)
+                batch = []
+    Task.objects.bulk_create(batch)
+
+    actions = [action for action, _ in AuditLog.ACTION_CHOICES]
+    for start in range(0, audit_rows, batch_size):
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                user=owners[i % len(owners)] if owners else None,
+                action=actions[i % len(actions)],
+                ip_address=f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}',
+                user_agent='benchmark',
+                details='Seeded by the benchmark fixture.',
+            )
+            for i in range(start, min(start + batch_size, audit_rows))
+        ])
+
+    get_search_backend().rebuild()
+    recompute_all()
+    return owners
+
+
+def logged_in_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def check_status(response, *expected):
+    """Stop the scenario on an unexpected response rather than time an error page."""
+    if response.status_code not in expected:
+        raise RuntimeError(f'Unexpected {response.status_code} response: {response.content[:200]!r}')
+
+
+def task_urlconf(crud_views):
+    """The project's URLconf with the task pages served by ``crud_views`` (views or async_views)."""
+    import types
+
+    from django.urls import include, path
+
+    import core.urls
+
+    from tasks.urls import task_patterns
+
+    module = types.ModuleType(f'benchmark_urls_{crud_views.__name__}')
+    module.urlpatterns = [
+        pattern for pattern in core.urls.urlpatterns if str(pattern.pattern) != 'tasks/'
+    ] + [path('tasks/', include(task_patterns(crud_views)))]
+    return module
+
+
+@scenario('bulk')
+def bench_bulk(size=500, **options):
+    """Create and delete ``size`` tasks one POST at a time vs one bulk request."""
+    user = make_user()
+    client = logged_in_client(user)
+    payloads = [{'title': f'Task {i}', 'description': 'Created by benchmark'} for i in range(size)]
+    results = {}
+
+    def create_each():
+        for payload in payloads:
+            client.post(reverse('create_task'), payload)
+
+    def delete_each():
+        for pk in Task.objects.filter(owner=user).values_list('pk', flat=True):
+            client.post(reverse('delete_task', args=[pk]))
+
+    def bulk_request(body):
+        response = client.post(reverse('bulk_tasks'), body, content_type='application/json')
+        check_status(response, 200, 201)
+
+    results['per_item_create'] = measure(create_each)
+    results['per_item_delete'] = measure(delete_each)
+    results['bulk_create'] = measure(bulk_request, {'action': 'create', 'tasks': payloads})
+    ids = list(Task.objects.filter(owner=user).values_list('pk', flat=True))
+    results['bulk_complete'] = measure(bulk_request, {'action': 'complete', 'ids': ids})
+    results['bulk_delete'] = measure(bulk_request, {'action': 'delete', 'ids': ids})
+
+    return {
+        'items': size,
+        **{name: {'total_ms': round(ms, 3), 'queries': queries} for name, (ms, queries) in results.items()},
+    }
+
+
+@scenario('login_throttle')
+def bench_login_throttle(size=500, **options):
+    """CPU time per failed login that reaches the hasher vs one refused by the throttle."""
+    from django.contrib.auth import authenticate
+    from django.test import RequestFactory
+
+    from tasks import throttle
+
+    user = make_user(password='Correct-horse-42!')
+    factory = RequestFactory()
+    limit = throttle.get_config()['USERNAME_LIMIT']
+    hashed, rejected = [], []
+
+    for i in range(max(size, limit + 1)):
+        request = factory.post('/', REMOTE_ADDR=f'10.0.{i // 250}.{i % 250}')
+        start = time.process_time()
+        authenticate(request, username=user.username, password='wrong-password')
+        elapsed = (time.process_time() - start) * 1000
+        (rejected if getattr(request, '_login_throttled', False) else hashed).append(elapsed)
+
+    return {
+        'attempts': len(hashed) + len(rejected),
+        'hashed_cpu': summarize(hashed),
+        'rejected_cpu': summarize(rejected),
+    }
+
+
+@scenario('sqlite_concurrency')
+def bench_sqlite_concurrency(size=500, duration=2.0, readers=4, **options):
+    """Concurrent read/write throughput on a SQLite file: default settings vs SQLITE_PRAGMAS."""
+    import sqlite3
+    import tempfile
+    import threading
+    from pathlib import Path
+
+    from django.conf import settings
+
+    from core.db import pragma_statements
+
+    def run(pragmas):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'bench.sqlite3'
+            setup = sqlite3.connect(path)
+            for statement in pragma_statements(pragmas):
+                setup.execute(statement)
+            setup.execute('CREATE TABLE task (id INTEGER PRIMARY KEY, owner INTEGER, title TEXT, body TEXT)')
+            setup.execute('CREATE INDEX task_owner ON task (owner, id)')
+            setup.executemany(
+                'INSERT INTO task (owner, title, body) VALUES (?, ?, ?)',
+                [(i % 50, f'Task {i}', 'x' * 200) for i in range(size * 10)],
+            )
+            setup.commit()
+            setup.close()
+
+            counts = {'reads': 0, 'writes': 0, 'busy': 0}
+            lock = threading.Lock()
+            stop = threading.Event()
+
+            def worker(write):
+                conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+                for statement in pragma_statements(pragmas):
+                    conn.execute(statement)
+                done = busy = 0
+                i = 0
+                while not stop.is_set():
+                    i += 1
+                    try:
+                        if write:
+                            conn.execute('INSERT INTO task (owner, title, body) VALUES (?, ?, ?)', (i % 50, 'w', 'y'))
+                            conn.commit()
+                        else:
+                            conn.execute('SELECT id, title FROM task WHERE owner = ? ORDER BY id DESC LIMIT 25', (i % 50,)).fetchall()
+                        done += 1
+                    except sqlite3.OperationalError:
+                        busy += 1
+                conn.close()
+                with lock:
+                    counts['writes' if write else 'reads'] += done
+                    counts['busy'] += busy
+
+            threads = [threading.Thread(target=worker, args=(False,)) for _ in range(readers)]
+            threads.append(threading.Thread(target=worker, args=(True,)))
+            for thread in threads:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            return {
+                'reads_per_s': round(counts['reads'] / duration, 1),
+                'writes_per_s': round(counts['writes'] / duration, 1),
+                'busy_errors': counts['busy'],
+            }
+
+    return {
+        'readers': readers,
+        'writers': 1,
+        'default': run({}),
+        'tuned': run(getattr(settings, 'SQLITE_PRAGMAS', {})),
+    }
+
+
+@scenario('async_views')
+def bench_async_views(size=500, concurrency=16, tasks_per_user=50, **options):
+    """Task list requests/s and latency: sync views over WSGI vs async views over ASGI."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.conf import settings
+    from django.db import connections
+    from django.test import AsyncClient
+
+    from tasks import async_views, views
+    from tasks.stats import recompute_all
+
+    users = [make_user() for _ in range(concurrency)]
+    for user in users:
+        seed_tasks(user, tasks_per_user)
+    # bulk_create sends no signals; build the counters now so requests only read
+    recompute_all()
+    per_client = max(1, size // concurrency)
+    url = '/tasks/'
+    # Render every request: the fragment cache would hide the view and ORM cost
+    caches = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'fragments': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    }
+
+    def run_wsgi():
+        # Log in up front: concurrent session writes lock the shared in-memory test database
+        clients = [logged_in_client(user) for user in users]
+
+        def worker(client):
+            samples = []
+            for _ in range(per_client):
+                start = time.perf_counter()
+                response = client.get(url)
+                samples.append((time.perf_counter() - start) * 1000)
+                check_status(response, 200)
+            connections.close_all()
+            return samples
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(worker, clients))
+        return time.perf_counter() - start, [ms for samples in results for ms in samples]
+
+    async def run_asgi():
+        clients = []
+        for user in users:
+            client = AsyncClient()
+            await client.aforce_login(user)
+            clients.append(client)
+
+        async def worker(client):
+            samples = []
+            for _ in range(per_client):
+                start = time.perf_counter()
+                response = await client.get(url)
+                samples.append((time.perf_counter() - start) * 1000)
+                check_status(response, 200)
+            return samples
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(worker(client) for client in clients))
+        return time.perf_counter() - start, [ms for samples in results for ms in samples]
+
+    def report(elapsed, samples):
+        return {'requests_per_s': round(len(samples) / elapsed, 1), 'latency': summarize(samples)}
+
+    with override_settings(CACHES=caches, TASK_LIST_CACHE='fragments'):
+        with override_settings(ROOT_URLCONF=task_urlconf(views)):
+            wsgi = report(*run_wsgi())
+        # Same stack as core/asgi.py: no sync-only middleware
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+        with override_settings(ROOT_URLCONF=task_urlconf(async_views), MIDDLEWARE=middleware):
+            asgi = report(*asyncio.run(run_asgi()))
+
+    return {'concurrency': concurrency, 'requests': per_client * concurrency, 'wsgi': wsgi, 'asgi': asgi}
+
+
+@scenario('export_import')
+def bench_export_import(size=500, **options):
+    """Stream ``size`` x 100 tasks out as CSV/JSONL (time, peak memory), then import them back."""
+    import io
+    import os
+    import tempfile
+    import tracemalloc
+
+    from django.core.management import call_command
+
+    from tasks.forms import TaskForm
+
+    rows = size * 100
+    user = make_user(is_staff=False)
+    seed_tasks(user, rows, description='Exported by the benchmark, with a "quoted", comma, text.')
+    client = logged_in_client(user)
+    results = {'rows': rows}
+
+    def download(fmt, sink):
+        response = client.get(reverse('export_tasks', args=[fmt]))
+        check_status(response, 200)
+        for chunk in response.streaming_content:
+            sink(chunk)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ('csv', 'jsonl'):
+            written = []
+            ms, queries = measure(download, fmt, lambda chunk: written.append(len(chunk)))
+            tracemalloc.start()
+            download(fmt, lambda chunk: None)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[f'export_{fmt}'] = {
+                'total_ms': round(ms, 3),
+                'rows_per_s': round(rows / (ms / 1000), 1),
+                'bytes': sum(written),
+                'queries': queries,
+                'peak_traced_mb': round(peak / 2 ** 20, 2),
+            }
+
+        path = os.path.join(tmp, 'tasks.csv')
+        with open(path, 'wb') as fh:
+            download('csv', fh.write)
+        importer = make_user()
+        ms, queries = measure(call_command, 'import_tasks', path, owner=importer.username, stdout=io.StringIO())
+        results['import_csv'] = {'total_ms': round(ms, 3), 'rows_per_s': round(rows / (ms / 1000), 1), 'queries': queries}
+
+    # Baseline: one TaskForm save per row, as create_task does
+    sample = min(rows, 1000)
+
+    def save_each():
+        for i in range(sample):
+            form = TaskForm({'title': f'Task {i}', 'description': 'Saved one by one'})
+            form.is_valid()
+            task = form.save(commit=False)
+            task.owner = importer
+            task.save()
+
+    ms, queries = measure(save_each)
+    results['per_row_save'] = {'rows': sample, 'rows_per_s': round(sample / (ms / 1000), 1), 'queries': queries}
+    return results
+
+
+@scenario('validation')
+def bench_validation(size=500, repeat=5, **options):
+    """Per-row and batch task validation: TaskForm vs the shared rules in tasks/validation.py."""
+    from tasks.forms import TaskForm
+    from tasks.validation import validate_row, validate_rows
+
+    rows = [
+        {'title': f'Task number {i}' if i % 10 else f'Bad <title> {i}', 'description': 'Validated by the benchmark.'}
+        for i in range(size)
+    ]
+
+    def per_row_us(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for row in rows:
+                func(row)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return round(best / len(rows) * 1e6, 2)
+
+    def batch_ms(func):
+        return round(min(measure(func, rows)[0] for _ in range(repeat)), 3)
+
+    return {
+        'rows': size,
+        'invalid_rows': sum(1 for row in rows if '<' in row['title']),
+        'single_us_per_row': {
+            'taskform': per_row_us(lambda row: TaskForm(row).is_valid()),
+            'validate_row': per_row_us(validate_row),
+        },
+        'batch_ms': {
+            'taskform_loop': batch_ms(lambda batch: [TaskForm(row).is_valid() for row in batch]),
+            'validate_rows': batch_ms(validate_rows),
+        },
+    }
+
+
+@scenario('admin_changelist')
+def bench_admin_changelist(size=500, **options):
+    """Admin changelist time and query count as Task / AuditLog rows grow (counts should stay flat)."""
+    from tasks.models import AuditLog
+    from tasks.search import get_search_backend
+
+    admin_user = make_user(is_staff=True, is_superuser=True)
+    client = logged_in_client(admin_user)
+    pages = {
+        'task': (reverse('admin:tasks_task_changelist'), {}),
+        'task_filtered': (reverse('admin:tasks_task_changelist'), {'is_completed__exact': '0'}),
+        'task_search': (reverse('admin:tasks_task_changelist'), {'q': 'Task'}),
+        'auditlog': (reverse('admin:tasks_auditlog_changelist'), {}),
+    }
+    results = {}
+    for rows in (size // 10, size):
+        # Top up to ``rows`` tasks and audit events, ten per owner
+        missing = rows - Task.objects.count()
+        owners = [make_user() for _ in range(max(1, missing // 10))]
+        for owner in owners:
+            seed_tasks(owner, 10)
+        AuditLog.objects.bulk_create(
+            [AuditLog(action='login', user=owners[i % len(owners)], details='benchmark') for i in range(missing)],
+            batch_size=1000,
+        )
+        get_search_backend().rebuild()  # seed_tasks bypasses the indexing signals
+        for name, (url, params) in pages.items():
+            client.get(url, params)  # warm caches (content types, permissions)
+            ms, queries = measure(client.get, url, params)
+            results.setdefault(name, {})[f'{Task.objects.count()}_tasks'] = {'ms': round(ms, 3), 'queries': queries}
+    return results
+
+
+# Load test (bench_load): one workload of page requests, replayed through the
+# test client and through local WSGI / ASGI servers.
+
+Call = collections.namedtuple('Call', 'method path data user status headers', defaults=(200, {}))
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def load_workload(owners, admin):
+    """Endpoint name -> function building the Call for request number i."""
+    ids = {
+        owner.pk: list(Task.objects.filter(owner=owner).order_by('pk').values_list('pk', flat=True))
+        for owner in owners
+    }
+    created = {}
+    list_url, create_url, login_url = reverse('task_list'), reverse('create_task'), reverse('login')
+
+    def owner(i):
+        return owners[i % len(owners)]
+
+    def word(i):
+        return FIXTURE_WORDS[i % len(FIXTURE_WORDS)]
+
+    def seeded_task(i):
+        pks = ids[owner(i).pk]
+        return pks[i // len(owners) % len(pks)]
+
+    def created_task(i):
+        # Delete what create_task added, so every driver sees the same data
+        if not created:
+            for title, pk in Task.objects.filter(title__startswith='Load test ').values_list('title', 'pk'):
+                created[int(title.rsplit(' ', 1)[1])] = pk
+        return created.get(i, 0)
+
+    return {
+        'task_list': lambda i: Call('GET', list_url, {}, owner(i)),
+        'task_list_search': lambda i: Call('GET', list_url, {'q': word(i)}, owner(i)),
+        'create_task': lambda i: Call('POST', create_url, {
+            'title': f'Load test {i}', 'description': 'Created by the load benchmark.',
+        }, owner(i), 302),
+        'edit_task': lambda i: Call('POST', reverse('edit_task', args=[seeded_task(i)]), {
+            'title': f'Edited {word(i)} {i}', 'description': 'Edited by the load benchmark.',
+        }, owner(i), 302),
+        'delete_task': lambda i: Call('POST', reverse('delete_task', args=[created_task(i)]), {}, owner(i), 302),
+        'login': lambda i: Call('POST', login_url, {'username': owner(i).username, 'password': FIXTURE_PASSWORD}, None, 302),
+        # Unknown users from distinct addresses: every attempt reaches the hasher, none is throttled
+        'failed_login': lambda i: Call(
+            'POST', login_url, {'username': f'nobody{i}', 'password': 'wrong-password'}, None, 200,
+            {'X-Forwarded-For': f'10.255.{i // 250 % 250}.{i % 250 + 1}'},
+        ),
+        'admin_tasks': lambda i: Call('GET', reverse('admin:tasks_task_changelist'), {}, admin),
+        'admin_tasks_search': lambda i: Call('GET', reverse('admin:tasks_task_changelist'), {'q': word(i)}, admin),
+        'admin_auditlog': lambda i: Call('GET', reverse('admin:tasks_auditlog_changelist'), {}, admin),
+    }
+
+
+def run_workload(workload, requests, send, concurrency=1):
+    """Send each endpoint's calls through ``send(call) -> (status, ms, queries)`` and report per endpoint."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    results = {}
+    for name, make_call in workload.items():
+        calls = [make_call(i) for i in range(requests)]
+        start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(concurrency) as executor:
+                outcomes = list(executor.map(send, calls))
+        else:
+            outcomes = [send(call) for call in calls]
+        elapsed = time.perf_counter() - start
+
+        failed = [status for call, (status, _, _) in zip(calls, outcomes) if status != call.status]
+        queries = sorted(count for _, _, count in outcomes if count is not None)
+        results[name] = {
+            'requests_per_s': round(len(calls) / elapsed, 1),
+            'latency': summarize([ms for _, ms, _ in outcomes]),
+            'queries': {'p50': queries[len(queries) // 2], 'max': queries[-1]} if queries else None,
+            'errors': len(failed),
+        }
+        if failed:
+            results[name]['error_statuses'] = sorted(set(failed))
+    return results
+
+
+def client_sender():
+    """Send calls through the Django test client, counting queries in-process."""
+    clients = {}
+
+    def send(call):
+        if call.user is None:
+            client = Client()  # the login page redirects a signed-in client
+        else:
+            if call.user.pk not in clients:
+                clients[call.user.pk] = logged_in_client(call.user)
+            client = clients[call.user.pk]
+        method = client.get if call.method == 'GET' else client.post
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = method(call.path, call.data, headers=call.headers)
+            elapsed = time.perf_counter() - start
+        return response.status_code, elapsed * 1000, len(queries)
+
+    return send
+
+
+def http_sender(base_url, users):
+    """Send calls over HTTP; query counts come from the Server-Timing header."""
+    import http.client
+    from urllib.parse import urlencode, urlsplit
+
+    from django.conf import settings
+    from django.utils.crypto import get_random_string
+
+    address = urlsplit(base_url)
+    # Sessions are created up front, outside the measured requests
+    sessions = {user.pk: logged_in_client(user).cookies[settings.SESSION_COOKIE_NAME].value for user in users}
+    # Any 32-character secret is valid as both the CSRF cookie and the form token
+    csrf_token = get_random_string(32)
+
+    def send(call):
+        cookies = {settings.CSRF_COOKIE_NAME: csrf_token}
+        if call.user is not None:
+            cookies[settings.SESSION_COOKIE_NAME] = sessions[call.user.pk]
+        headers = {'Cookie': '; '.join(f'{name}={value}' for name, value in cookies.items()), **call.headers}
+        path, body = call.path, None
+        if call.method == 'GET':
+            if call.data:
+                path += '?' + urlencode(call.data)
+        else:
+            body = urlencode({**call.data, 'csrfmiddlewaretoken': csrf_token})
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        conn = http.client.HTTPConnection(address.hostname, address.port, timeout=60)
+        try:
+            start = time.perf_counter()
+            conn.request(call.method, path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+        finally:
+            conn.close()
+        match = SERVER_TIMING_QUERIES.search(response.getheader('Server-Timing') or '')
+        return response.status, elapsed * 1000, int(match.group(1)) if match else None
+
+    return send
+
+
+def shared_memory_connections():
+    """In-memory SQLite test databases, which the servers below share and serialize on."""
+    from django.db import connections
+
+    return {conn.alias: conn for conn in connections.all() if conn.vendor == 'sqlite' and conn.is_in_memory_db()}
+
+
+@contextmanager
+def wsgi_server():
+    """Serve the sync views from Django's threaded WSGI server on a free port; yields its URL."""
+    import threading
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    from tasks import views
+
+    shared = shared_memory_connections()
+    with override_settings(ROOT_URLCONF=task_urlconf(views)):
+        application = WSGIHandler()
+        if shared:
+            # One connection for every request thread, as LiveServerTestCase
+            # does; a lock keeps their transactions from interleaving
+            lock = threading.Lock()
+            handler = application
+
+            def application(environ, start_response):
+                with lock:
+                    return list(handler(environ, start_response))
+
+            for conn in shared.values():
+                conn.inc_thread_sharing()
+        server = ThreadedWSGIServer(('127.0.0.1', 0), WSGIRequestHandler, connections_override=shared)
+        server.set_app(application)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f'http://127.0.0.1:{server.server_address[1]}'
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            for conn in shared.values():
+                conn.dec_thread_sharing()
+
+
+@contextmanager
+def asgi_server():
+    """Serve the async views from uvicorn on a free port; yields its URL. Needs uvicorn installed."""
+    import asyncio
+    import socket
+    import threading
+
+    import uvicorn
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+
+    from tasks import async_views
+
+    # Same stack as core/asgi.py: no sync-only middleware
+    middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+    with override_settings(ASGI=True, ROOT_URLCONF=task_urlconf(async_views), MIDDLEWARE=middleware):
+        application = get_asgi_application()
+        if shared_memory_connections():
+            # Each request gets its own database thread; in-memory SQLite
+            # reports "table is locked" on concurrent writes, so take turns
+            handler, lock = application, asyncio.Lock()
+
+            async def application(scope, receive, send):
+                async with lock:
+                    await handler(scope, receive, send)
+
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        server = uvicorn.Server(uvicorn.Config(application, lifespan='off', log_level='warning'))
+        thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+        thread.start()
+        try:
+            while not server.started:
+                if not thread.is_alive():
+                    raise RuntimeError("uvicorn failed to start.")
+                time.sleep(0.01)
+            yield f'http://127.0.0.1:{sock.getsockname()[1]}'
+        finally:
+            server.should_exit = True
+            thread.join()
+            sock.close()
+
+
+@scenario('load')
+def bench_load(size=500, users=10, tasks_per_user=None, audit_rows=None, requests=50, concurrency=8,
+               server='client', **options):
+    """Seed users x tasks and audit rows, then replay every page through the test client and local WSGI/ASGI servers."""
+    tasks_per_user = size if tasks_per_user is None else tasks_per_user
+    audit_rows = size * 10 if audit_rows is None else audit_rows
+
+    start = time.perf_counter()
+    owners = seed_fixture(users, tasks_per_user, audit_rows)
+    seed_ms = (time.perf_counter() - start) * 1000
+    admin = make_user(is_staff=True, is_superuser=True)
+    results = {
+        'users': users,
+        'tasks': Task.objects.count(),
+        'audit_rows': audit_rows,
+        'seed_ms': round(seed_ms, 3),
+        'requests_per_endpoint': requests,
+    }
+
+    drivers = ('client', 'wsgi', 'asgi') if server == 'all' else (server,)
+    for driver in drivers:
+        workload = load_workload(owners, admin)
+        if driver == 'client':
+            # One thread: queries are counted on this thread's connection
+            results[driver] = {'concurrency': 1, **run_workload(workload, requests, client_sender())}
+            continue
+        if driver == 'asgi':
+            try:
+                import uvicorn  # noqa: F401
+            except ImportError:
+                results[driver] = {'skipped': "uvicorn is not installed."}
+                continue
+        serve = wsgi_server if driver == 'wsgi' else asgi_server
+        with serve() as url:
+            send = http_sender(url, [*owners, admin])
+            results[driver] = {
+                'concurrency': concurrency,
+                # Requests queue on one connection with an in-memory SQLite test database
+                'serialized': bool(shared_memory_connections()),
+                **run_workload(workload, requests, send, concurrency),
+            }
+    return results
+
+
+@scenario('password_hashing')
+def bench_password_hashing(size=500, concurrency=8, **options):
+    """Argon2 time per hash with the ARGON2 settings, the login that re-hashes an old hash, and the ASGI pool."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password
+
+    from core.hashers import get_config
+
+    hasher = get_hasher()
+    samples = [measure(hasher.encode, 'Benchmark-password-1!', hasher.salt())[0] for _ in range(min(size, 20))]
+
+    # A PBKDF2 hash is upgraded by the first login and verified with Argon2 afterwards
+    user = make_user()
+    user.password = make_password(FIXTURE_PASSWORD, hasher='pbkdf2_sha256')
+    user.save(update_fields=['password'])
+    logins = {}
+    for name in ('old_hash_login', 'rehashed_login'):
+        ms, queries = measure(Client().post, reverse('login'), {'username': user.username, 'password': FIXTURE_PASSWORD})
+        logins[name] = {'ms': round(ms, 3), 'queries': queries}
+    user.refresh_from_db()
+
+    def burst(asgi):
+        with override_settings(ASGI=asgi):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as executor:
+                list(executor.map(lambda _: hasher.encode('Benchmark-password-1!', hasher.salt()), range(concurrency * 2)))
+            return round(concurrency * 2 / (time.perf_counter() - start), 1)
+
+    return {
+        'config': get_config(),
+        'hash': summarize(samples),
+        **logins,
+        'rehashed_to': identify_hasher(user.password).algorithm,
+        'must_update_after_login': hasher.must_update(user.password),
+        # Hashes/s from ``concurrency`` request threads: all at once (WSGI path) vs through the bounded pool (ASGI)
+        'burst_hashes_per_s': {'in_request_threads': burst(False), 'bounded_pool': burst(True)},
+    }
+
+
+@scenario('sessions')
+def bench_sessions(size=500, **options):
+    """Queries per signed-in request with each session engine, and the batched expired-session sweep."""
+    from datetime import timedelta
+
+    from django.conf import settings
+    from django.contrib.sessions.models import Session
+    from django.utils import timezone
+
+    from core.sessions import local_cache, sweep_expired
+
+    user = make_user()
+    seed_tasks(user, 50)
+    requests = min(size, 200)
+    results = {}
+    for backend, engine in settings.SESSION_ENGINES.items():
+        local_cache.clear()
+        # One process serves every request, so cached_db may keep its local LRU
+        with override_settings(SESSION_ENGINE=engine, SESSION_LOCAL_CACHE={'TTL': 5}):
+            client = logged_in_client(user)
+            client.get(reverse('task_list'))  # warm the fragment and stats caches
+            samples, queries, session_queries = [], 0, 0
+            for _ in range(requests):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = client.get(reverse('task_list'))
+                    samples.append((time.perf_counter() - start) * 1000)
+                check_status(response, 200)
+                queries += len(captured)
+                session_queries += sum('django_session' in query['sql'] for query in captured)
+        results[backend] = {
+            'queries_per_request': round(queries / requests, 2),
+            'session_queries_per_request': round(session_queries / requests, 2),
+            'latency': summarize(samples),
+        }
+
+    # Expired sessions: one batched sweep vs the single DELETE of `clearsessions`
+    rows = size * 20
+    expired = timezone.now() - timedelta(days=1)
+
+    def seed_expired(prefix):
+        Session.objects.bulk_create(
+            [Session(session_key=f'{prefix}{i:030d}', session_data='', expire_date=expired) for i in range(rows)],
+            batch_size=2000,
+        )
+
+    seed_expired('b')
+    batch_size = 1000
+    ms, queries = measure(sweep_expired, batch_size)
+    results['sweep'] = {
+        'rows': rows,
+        'batched_total_ms': round(ms, 3),
+        'batched_ms_per_batch': round(ms / -(-rows // batch_size), 3),
+        'queries': queries,
+    }
+    seed_expired('s')
+    ms, _ = measure(Session.objects.filter(expire_date__lt=timezone.now()).delete)
+    results['sweep']['single_delete_ms'] = round(ms, 3)
+    return results
+
+
+@scenario('logging')
+def bench_logging(size=500, concurrency=8, **options):
+    """Concurrent logging: caller latency and records/s for a plain FileHandler vs the queued JSON pipeline."""
+    import os
+    import tempfile
+    import threading
+
+    from core.logs import QueueingHandler
+
+    per_thread = size * 4
+
+    def run(handler, flush):
+        logger = logging.getLogger('benchmark.logging')
+        logger.handlers, logger.propagate = [handler], False
+        logger.setLevel(logging.INFO)
+        samples = [[] for _ in range(concurrency)]
+
+        def worker(index):
+            for i in range(per_thread):
+                start = time.perf_counter()
+                logger.warning(
+                    "Security Audit: Failed login attempt for username: %s", f'user{i}',
+                    extra={'event': 'login_failed', 'ip': f'10.0.{index}.{i % 250}'},
+                )
+                samples[index].append((time.perf_counter() - start) * 1000)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+        logging.disable(logging.NOTSET)
+        try:
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            callers_done = time.perf_counter() - start
+            flush()  # until every record is on disk
+            written = time.perf_counter() - start
+        finally:
+            logging.disable(logging.CRITICAL)
+            logger.handlers = []
+            handler.close()
+        records = concurrency * per_thread
+        return {
+            'records': records,
+            'caller_latency': summarize([ms for thread_samples in samples for ms in thread_samples]),
+            'callers_records_per_s': round(records / callers_done, 1),
+            'written_records_per_s': round(records / written, 1),
+        }
+
+    def stall(handler, every=100, ms=5):
+        # Simulates writeback/fsync stalls: tmpfs or a page cache never blocks
+        emit, count = handler.emit, itertools.count(1)
+
+        def slow_emit(record):
+            if next(count) % every == 0:
+                time.sleep(ms / 1000)
+            emit(record)
+
+        handler.emit = slow_emit
+        return handler
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for disk in ('fast_disk', 'stalled_disk'):
+            slow = stall if disk == 'stalled_disk' else (lambda handler: handler)
+            plain = logging.FileHandler(os.path.join(tmp, f'{disk}.log'))
+            plain.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+            slow(plain)
+            queued = QueueingHandler([{
+                'class': 'core.logs.RotatingJSONFileHandler',
+                'filename': os.path.join(tmp, f'{disk}-security.log'),
+                'max_bytes': 2 ** 20,
+            }], queue_size=100_000)
+            slow(queued.sinks[0])
+            results[disk] = {
+                'file_handler': run(plain, plain.flush),
+                'queued_json': run(queued, queued.stop),
+            }
+        results['rotated_files'] = sum(bool(re.search(r'\.log\.\d+(\.gz)?$', name)) for name in os.listdir(tmp))
+    return results
+
+
+@scenario('agenda')
+def bench_agenda(size=500, users=10, **options):
+    """
+    Agenda buckets from index range scans vs filtering the user's tasks in
+    Python, with the query plan of every bucket.
+    """
+    import datetime
+
+    from django.utils import timezone
+
+    from tasks.agenda import agenda_sections, bounds, section_queryset
+
+    now = timezone.now()
+    owners = [make_user() for _ in range(users)]
+    for owner in owners:
+        # Due dates spread over two weeks either side of now; some open-ended
+        Task.objects.bulk_create([
+            Task(
+                owner=owner, title=f'Task {i}', description='Benchmark agenda task.',
+                is_completed=i % 3 == 0,
+                due_at=None if i % 4 == 0 else now + datetime.timedelta(minutes=(i * 97) % 40320 - 20160),
+            )
+            for i in range(size)
+        ], batch_size=1000)
+    owner = owners[0]
+
+    plans = {}
+    for key, (start, end) in bounds(now).items():
+        plans[key] = section_queryset(owner.pk, start, end).explain()
+
+    def python_side():
+        # The unindexed alternative: every task of the user, bucketed here
+        ranges = bounds(now)
+        tasks = [task for task in Task.objects.filter(owner=owner) if not task.is_completed and task.due_at]
+        return {
+            key: sorted(
+                (task for task in tasks if (start is None or task.due_at >= start) and task.due_at < end),
+                key=lambda task: (task.due_at, task.pk),
+            )
+            for key, (start, end) in ranges.items()
+        }
+
+    results = {'tasks': Task.objects.count(), 'plans': plans}
+    for name, func in (('index_range', lambda: agenda_sections(owner.pk, now)), ('python_side', python_side)):
+        timings, queries = [], 0
+        for _ in range(20):
+            ms, queries = measure(func)
+            timings.append(ms)
+        results[name] = {**summarize(timings), 'queries': queries}
+
+    client = logged_in_client(owner)
+    client.get(reverse('task_agenda'))
+    ms, queries = measure(client.get, reverse('task_agenda'))
+    results['page'] = {'ms': round(ms, 3), 'queries': queries}
+    return results
+
+
+@scenario('list_projection')
+def bench_list_projection(size=500, description_kb=8, **options):
+    """
+    Memory and time to load a page of tasks with multi-KB descriptions: full
+    rows vs the list projection (Task.objects.for_list()), plus the list and
+    admin changelist pages end to end.
+    """
+    import tracemalloc
+
+    from django.core.cache import cache
+
+    from tasks.pagination import paginate
+
+    owner = make_user()
+    seed_tasks(owner, size, description='x' * (description_kb * 1024))
+    full = Task.objects.filter(owner=owner)
+    results = {'tasks': size, 'description_kb': description_kb}
+
+    for page_size in (25, 200):
+        for name, queryset in (('full_rows', full), ('for_list', full.for_list())):
+            timings = []
+            for _ in range(10):
+                ms, _ = measure(lambda: list(paginate(queryset, page_size=page_size)))
+                timings.append(ms)
+            tracemalloc.start()
+            page = list(paginate(queryset, page_size=page_size))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del page
+            results.setdefault(f'page_{page_size}', {})[name] = {
+                **summarize(timings), 'peak_kb': round(peak / 1024, 1),
+            }
+
+    admin_user = make_user(is_staff=True, is_superuser=True)
+    pages = (
+        ('task_list', logged_in_client(owner), reverse('task_list')),
+        ('admin_changelist', logged_in_client(admin_user), reverse('admin:tasks_task_changelist')),
+    )
+    for name, client, url in pages:
+        client.get(url)  # warm caches (content types, permissions)
+        cache.clear()  # but render the task table rather than hit its fragment cache
+        tracemalloc.start()
+        ms, queries = measure(client.get, url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {'ms': round(ms, 3), 'queries': queries, 'peak_kb': round(peak / 1024, 1)}
+    return results
+
+
+@scenario('rbac')
+def bench_rbac(size=500, **options):
+    """
+    Query counts per task view for an owner and for a manager whose change /
+    delete permissions come from a group, on a cold and a warm permission
+    cache, split into permission table and user table reads.
+    """
+    from django.contrib.auth.models import Group, Permission
+    from django.core.cache import cache
+
+    owner, manager = make_user(), make_user()
+    group = Group.objects.create(name='benchmark managers')
+    group.permissions.set(Permission.objects.filter(
+        content_type__app_label='tasks', codename__in=['change_task', 'delete_task'],
+    ))
+    manager.groups.add(group)
+    seed_tasks(owner, max(size // 10, 20))
+    pks = iter(Task.objects.filter(owner=owner).values_list('pk', flat=True))
+    form = {'title': 'Edited', 'description': 'Edited by benchmark', 'priority': '2'}
+
+    def requests(user):
+        client = logged_in_client(user)
+        edit_pk, delete_pk, bulk_pk = next(pks), next(pks), next(pks)
+        return {
+            'task_list': lambda: client.get(reverse('task_list')),
+            'edit_get': lambda: client.get(reverse('edit_task', args=[edit_pk])),
+            'edit_post': lambda: client.post(reverse('edit_task', args=[edit_pk]), form),
+            'delete_get': lambda: client.get(reverse('delete_task', args=[delete_pk])),
+            'bulk_complete': lambda: client.post(
+                reverse('bulk_tasks'), {'action': 'complete', 'ids': [bulk_pk]}, content_type='application/json',
+            ),
+            'api_detail': lambda: client.get(reverse('api_task_detail', args=[edit_pk])),
+            'delete_post': lambda: client.post(reverse('delete_task', args=[delete_pk])),
+        }
+
+    def count(call):
+        with CaptureQueriesContext(connection) as queries:
+            response = call()
+        check_status(response, 200, 302)
+        sql = [query['sql'] for query in queries]
+        return {
+            'queries': len(sql),
+            'permission_queries': sum('"auth_permission"' in s or '"auth_group"' in s for s in sql),
+            'user_queries': sum(s.startswith('SELECT') and 'FROM "auth_user"' in s for s in sql),
+        }
+
+    results = {}
+    for name, user in (('owner', owner), ('manager', manager)):
+        cache.clear()
+        cold = {view: count(call) for view, call in requests(user).items()}
+        warm = {view: count(call) for view, call in requests(user).items()}
+        results[name] = {'cold': cold, 'warm': warm}
+    return results
+
+
+@scenario('trash')
+def bench_trash(size=500, batch_size=500, **options):
+    """
+    Removing an account with ``size`` * 10 tasks: one cascading delete vs
+    deactivation now plus a batched purge; and deleting a task (soft) vs
+    purging the trash. Reports the longest single statement of each.
+    """
+    import datetime
+
+    from django.utils import timezone
+
+    from tasks import trash
+
+    def longest_statement(queries):
+        return round(max((float(query['time']) for query in queries), default=0) * 1000, 3)
+
+    def timed(func, *args, **kwargs):
+        # The query log keeps 9000 entries; once full, captured counts read 0
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+        return {
+            'ms': round(elapsed * 1000, 3), 'queries': len(queries),
+            'longest_statement_ms': longest_statement(queries),
+        }
+
+    tasks = size * 10
+    cascaded, removed = make_user(), make_user()
+    for user in (cascaded, removed):
+        seed_tasks(user, tasks)
+    results = {'tasks_per_account': tasks}
+    # The old path: every task is collected, signalled and deleted in the request's transaction
+    # (its query count stops at the 9000 the query log holds)
+    results['cascade_delete'] = timed(cascaded.delete)
+    results['schedule_removal'] = timed(trash.schedule_account_removal, removed)
+    results['purge_account'] = timed(trash.purge_accounts, batch_size=batch_size)
+    results['purge_account']['transactions'] = -(-tasks // batch_size)
+
+    owner = make_user()
+    seed_tasks(owner, size)
+    client = logged_in_client(owner)
+    pks = list(Task.objects.filter(owner=owner).values_list('pk', flat=True))
+    results['delete_view'] = timed(client.post, reverse('delete_task', args=[pks[0]]))
+    results['bulk_delete'] = timed(
+        client.post, reverse('bulk_tasks'), {'action': 'delete', 'ids': pks[1:]}, content_type='application/json',
+    )
+    results['restore_view'] = timed(client.post, reverse('restore_task', args=[pks[0]]))
+    later = timezone.now() + trash.retention() + datetime.timedelta(seconds=1)
+    results['purge_trash'] = timed(trash.purge_trash, before=later, batch_size=batch_size)
+    return results
@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Drops the sync-only WhiteNoise middleware and enables the async task views
+os.environ.setdefault('DJANGO_ASGI', 'True')
 
+# WhiteNoise is WSGI-only, so under ASGI the reverse proxy serves STATIC_ROOT
+# (after `manage.py collectstatic`) at STATIC_URL; Django does not.
 application = get_asgi_application()
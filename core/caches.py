@@ -0,0 +1,20 @@
+from django.conf import settings
+
+# Whether a cache is shared by every worker process.
+# Entries in a per-process cache (locmem) are invisible to the other workers,
+# and so are deletions: anything invalidated on write (fragments, counters,
+# permission sets, sessions) would stay stale in every worker but the one
+# that handled the write. Such features only use a cache that is shared, or
+# any cache when CACHE_SINGLE_PROCESS declares that one process serves every
+# request (runserver, a single worker, the tests and benchmarks).
+
+PER_PROCESS_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def is_shared(alias='default'):
+    """True if every worker sees the same entries in cache ``alias``."""
+    if getattr(settings, 'CACHE_SINGLE_PROCESS', False):
+        return True
+    return settings.CACHES[alias]['BACKEND'] not in PER_PROCESS_BACKENDS
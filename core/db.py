@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import current_timings
+
+# SQLite performance profile: applied to every new SQLite connection.
+# WAL lets readers proceed while a writer (e.g. the audit sink) commits,
+# synchronous=NORMAL is crash-safe under WAL, busy_timeout makes writers
+# wait instead of failing with "database is locked", and mmap_size serves
+# reads from the page cache without extra copies.
+
+
+def pragma_statements(pragmas):
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(getattr(settings, 'SQLITE_PRAGMAS', {})):
+            cursor.execute(statement)
+
+
+def time_queries(execute, sql, params, many, context):
+    """Add each query to the current request's timings (see PerformanceMiddleware)."""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.sql_seconds += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # Installed once per connection rather than per request: wrapping every
+    # request would cost async views two thread hops to reach the connections.
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
@@ -0,0 +1,74 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+# Argon2 with its cost taken from settings.ARGON2 (pick values for a host
+# with `manage.py calibrate_argon2`). The algorithm name stays "argon2", so
+# hashes made with other parameters still verify, and must_update() makes
+# Django re-hash them with the current ones on the next successful login.
+# PBKDF2/bcrypt hashes further down PASSWORD_HASHERS are upgraded the same way.
+
+DEFAULTS = {
+    # Django's own Argon2 parameters: no mass re-hash until they are changed
+    'TIME_COST': Argon2PasswordHasher.time_cost,
+    'MEMORY_COST': Argon2PasswordHasher.memory_cost,  # KiB
+    'PARALLELISM': Argon2PasswordHasher.parallelism,
+    'THREADS': None,  # ASGI hashing pool size; None = CPU count
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'ARGON2', {}))
+    return config
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=get_config()['THREADS'] or os.cpu_count() or 1,
+                    thread_name_prefix='password-hashing',
+                )
+    return _pool
+
+
+def run_hashing(func, *args):
+    # Under ASGI every request gets its own thread, so nothing else bounds
+    # how many hashes run at once: each one holds MEMORY_COST and all of them
+    # compete for the CPU. A fixed pool queues the surplus instead. WSGI
+    # workers are already a fixed number, so they hash in place.
+    if not settings.ASGI:
+        return func(*args)
+    return get_pool().submit(func, *args).result()
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 with time/memory/parallelism from settings.ARGON2."""
+
+    @property
+    def time_cost(self):
+        return get_config()['TIME_COST']
+
+    @property
+    def memory_cost(self):
+        return get_config()['MEMORY_COST']
+
+    @property
+    def parallelism(self):
+        return get_config()['PARALLELISM']
+
+    def encode(self, password, salt):
+        return run_hashing(super().encode, password, salt)
+
+    def verify(self, password, encoded):
+        return run_hashing(super().verify, password, encoded)
@@ -0,0 +1,275 @@
+import atexit
+import copy
+import datetime
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+from django.utils.module_loading import import_string
+
+try:
+    import fcntl
+except ImportError:  # Windows: rollovers are not coordinated across processes
+    fcntl = None
+
+# Non-blocking logging pipeline (wired up in LOGGING, core/settings.py).
+# A request thread only puts the record on a bounded in-memory queue. A
+# listener thread then renders the message and JSON and writes it to the
+# sinks: a JSON-lines file rotated by size and age with gzip-compressed
+# backups, shared safely by several worker processes, and the console. When
+# the queue is full, records are dropped and counted rather than making the
+# request wait.
+#
+# Because messages are rendered on the listener thread, log with %-style args
+# (logger.info("... %s", value)) instead of f-strings. A disabled level then
+# costs nothing, and values that are expensive to build can be wrapped in
+# Lazy. Args and extra fields must not change after the logging call.
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+# Extra fields Django adds that are too large or too live to serialize
+SKIPPED_FIELDS = {'request', 'server_time'}
+
+
+class Lazy:
+    """A log value that is computed only when a sink writes the record."""
+
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __call__(self):
+        return self.func(*self.args)
+
+    def __str__(self):
+        return str(self())
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields, exception."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and key not in SKIPPED_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=self.encode_value)
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, Lazy):
+            return value()
+        return str(value)
+
+
+class RotatingJSONFileHandler(logging.FileHandler):
+    """
+    JSON-lines file shared by every worker process. It rolls over at
+    ``max_bytes`` or ``interval`` seconds after the file was started,
+    whichever comes first, and keeps ``backup_count`` backups:
+    security.log.1 is the newest, older ones are gzipped (security.log.2.gz...).
+
+    Workers coordinate through ``<filename>.rotation``. It records when the
+    current file was started (the file's mtime moves with every write), and a
+    rollover holds an flock on it, so one worker rotates and the others find
+    the new file. Each worker reopens the file once its inode changes, as
+    WatchedFileHandler does. security.log.1 is only compressed at the next
+    rollover, when no worker can still be appending to it.
+    """
+
+    def __init__(self, filename, max_bytes=50 * 2 ** 20, interval=86400, backup_count=14, encoding='utf-8'):
+        # delay: commands that never log do not create the file
+        super().__init__(filename, encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = max(backup_count, 1)
+        self.state_filename = self.baseFilename + '.rotation'
+        self.inode = None
+        self.rollover_at = None
+        self.setFormatter(JSONFormatter())
+
+    def emit(self, record):
+        try:
+            if self.stream is None or self.replaced():
+                with self.locked_state() as state:
+                    self.reopen(state)
+            if self.rollover_due():
+                with self.locked_state() as state:
+                    self.rollover(state)
+        except Exception:
+            self.handleError(record)
+            return
+        super().emit(record)
+
+    @contextmanager
+    def locked_state(self):
+        """The rotation state file, locked against the other workers until the block ends."""
+        with open(self.state_filename, 'a+', encoding='ascii') as state:
+            if fcntl is not None:
+                fcntl.flock(state, fcntl.LOCK_EX)  # released when the file is closed
+            yield state
+
+    def replaced(self):
+        """True if another worker rotated the file since this one opened it."""
+        try:
+            stat = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self.inode
+
+    def reopen(self, state):
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = self._open()
+        stat = os.fstat(self.stream.fileno())
+        self.inode = (stat.st_dev, stat.st_ino)
+        started = self.read_start(state)
+        if started is None or not stat.st_size:
+            # A new file starts a new window
+            started = time.time()
+            state.seek(0)
+            state.truncate()
+            state.write(repr(started))
+            state.flush()
+        self.rollover_at = started + self.interval if self.interval else None
+
+    @staticmethod
+    def read_start(state):
+        state.seek(0)
+        try:
+            return float(state.read())
+        except ValueError:
+            return None
+
+    def rollover_due(self):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return bool(self.max_bytes) and os.fstat(self.stream.fileno()).st_size >= self.max_bytes
+
+    def rollover(self, state):
+        # Another worker may have rotated, or started a later window, while
+        # this one waited for the lock: then reopening is all that is left
+        if not self.replaced():
+            size = os.fstat(self.stream.fileno()).st_size
+            started = self.read_start(state)
+            expired = self.interval and (started is None or time.time() >= started + self.interval)
+            if size and (expired or self.max_bytes and size >= self.max_bytes):
+                self.rotate_backups()
+        self.reopen(state)
+
+    def backup_filename(self, number):
+        filename = f'{self.baseFilename}.{number}'
+        return filename if number == 1 else filename + '.gz'
+
+    def rotate_backups(self):
+        for number in range(self.backup_count - 1, 1, -1):
+            if os.path.exists(self.backup_filename(number)):
+                os.replace(self.backup_filename(number), self.backup_filename(number + 1))
+        newest = self.backup_filename(1)
+        if os.path.exists(newest):
+            if self.backup_count > 1:
+                with open(newest, 'rb') as src, gzip.open(self.backup_filename(2), 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+            os.remove(newest)
+        # Workers still writing to the old inode follow it to security.log.1
+        os.replace(self.baseFilename, newest)
+
+
+class Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than fail when stopping with a full queue
+        self.queue.put(self._sentinel)
+
+
+class QueueingHandler(QueueHandler):
+    """
+    Enqueues records for a QueueListener thread that feeds ``sinks``: handler
+    configs with a dotted 'class', an optional 'level' and the class's
+    keyword arguments. The listener starts on first use in each process, so
+    forked workers get their own thread.
+    """
+
+    def __init__(self, sinks, queue_size=10000):
+        # Built before this handler, so logging.shutdown() closes them after it
+        self.sinks = [self.build_sink(dict(sink)) for sink in sinks]
+        super().__init__(queue.Queue(queue_size))
+        self.listener = None
+        self.pid = None
+        self.dropped = 0
+        self.start_lock = threading.Lock()
+
+    @staticmethod
+    def build_sink(config):
+        level = config.pop('level', logging.NOTSET)
+        handler = import_string(config.pop('class'))(**config)
+        handler.setLevel(level)
+        return handler
+
+    def start(self):
+        with self.start_lock:
+            if self.pid == os.getpid():
+                return
+            # A forked child inherits the queue but not the listener thread
+            self.queue = queue.Queue(self.queue.maxsize)
+            self.listener = Listener(self.queue, *self.sinks, respect_handler_level=True)
+            self.listener.start()
+            self.pid = os.getpid()
+            atexit.register(self.stop)  # Runs before logging.shutdown(): drains the queue first
+
+    def stop(self):
+        listener, self.listener = self.listener, None
+        if listener is not None and self.pid == os.getpid():
+            listener.stop()
+
+    def prepare(self, record):
+        # Unlike QueueHandler.prepare(), leave msg and args for the listener
+        # to render. Only the traceback is rendered now, while its frames are
+        # still current.
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1  # approximate under contention; never blocks
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Dropped %d log records: the logging queue was full.", (dropped,), None,
+            )
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                self.dropped += dropped
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,102 @@
+import bisect
+import threading
+from contextvars import ContextVar
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+
+# In-process request metrics, exported in the Prometheus text format.
+# Each worker process keeps its own histograms; Prometheus sums them per
+# instance. Recording is a bisect plus a few additions under one lock.
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTimings:
+    """Per-request accumulators filled by the SQL wrapper and the template backend."""
+    __slots__ = ('queries', 'sql_seconds', 'template_seconds', 'template_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets=BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label, value):
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = {label: (list(counts), total) for label, (counts, total) in self._series.items()}
+        for label, (counts, total) in sorted(snapshot.items()):
+            view = _escape(label)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{view="{view}",le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{view}"}} {cumulative}')
+        return lines
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_DURATION = Histogram('http_request_duration_seconds', 'Wall time of each request by view.')
+SQL_DURATION = Histogram('http_request_sql_duration_seconds', 'Total SQL time of each request by view.')
+SQL_QUERIES = Histogram(
+    'http_request_sql_queries', 'Number of SQL queries per request by view.',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+TEMPLATE_DURATION = Histogram('http_request_template_duration_seconds', 'Template render time of each request by view.')
+
+HISTOGRAMS = [REQUEST_DURATION, SQL_DURATION, SQL_QUERIES, TEMPLATE_DURATION]
+
+
+def observe_request(view_name, seconds, timings):
+    REQUEST_DURATION.observe(view_name, seconds)
+    SQL_DURATION.observe(view_name, timings.sql_seconds)
+    SQL_QUERIES.observe(view_name, timings.queries)
+    TEMPLATE_DURATION.observe(view_name, timings.template_seconds)
+
+
+def render_metrics():
+    from tasks import fragment_cache
+
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    counters = fragment_cache.get_counters()
+    lines += [
+        '# HELP task_list_cache_requests_total Task table fragment cache lookups by result.',
+        '# TYPE task_list_cache_requests_total counter',
+        f'task_list_cache_requests_total{{result="hit"}} {counters["hits"]}',
+        f'task_list_cache_requests_total{{result="miss"}} {counters["misses"]}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+@staff_member_required
+def metrics_view(request):
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,119 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestTimings, current_timings, observe_request
+from .routers import RoutingState, routing_state
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, SQL query count/time and template render time per request.
+
+    Results feed the histograms served at /metrics/ and, when SERVER_TIMING is
+    enabled, a Server-Timing response header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'SERVER_TIMING', False)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, time.perf_counter() - start, timings)
+
+    async def __acall__(self, request):
+        # SQL is counted by time_queries (core/db.py), installed once on every
+        # connection; sync_to_async copies the context, so ORM calls in worker
+        # threads add to this request's timings without wrapping per request.
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, time.perf_counter() - start, timings)
+
+    def finish(self, request, response, elapsed, timings):
+        match = request.resolver_match
+        observe_request(match.view_name if match else '<unresolved>', elapsed, timings)
+
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'app;dur={elapsed * 1000:.1f}, '
+                f'db;dur={timings.sql_seconds * 1000:.1f};desc="{timings.queries} queries", '
+                f'tpl;dur={timings.template_seconds * 1000:.1f}'
+            )
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin a request's reads to the primary database when it may need to see a
+    recent write: unsafe methods, requests that write, and any request within
+    REPLICA_STICKY_SECONDS of that client's last write (tracked by a cookie).
+    """
+
+    COOKIE_NAME = 'db_pin'
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state, token = self.pin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        # sync_to_async copies the context, so ORM calls in worker threads see this state
+        state, token = self.pin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(response, state)
+
+    def pin(self, request):
+        pinned = request.method not in self.SAFE_METHODS or self.COOKIE_NAME in request.COOKIES
+        state = RoutingState(pinned=pinned)
+        return state, routing_state.set(state)
+
+    def finish(self, response, state):
+        if state.wrote and self.sticky_seconds:
+            response.set_cookie(
+                self.COOKIE_NAME, '1',
+                max_age=self.sticky_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Strict',
+            )
+        return response
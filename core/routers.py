@@ -0,0 +1,48 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Read-replica routing.
+# Reads of the routed apps go to a random replica unless the current request
+# is pinned to the primary: unsafe requests, requests that have written, and
+# requests carrying the sticky cookie set after a recent write (see
+# core.middleware.ReplicaPinningMiddleware) all read their own writes.
+# Code outside a request (management commands, background threads) has no
+# routing state and always uses the primary: prune_auditlog, purge_tasks and
+# recompute_task_stats read what they are about to write or delete.
+
+ROUTED_APP_LABELS = {'tasks', 'admin'}
+
+
+class RoutingState:
+    __slots__ = ('pinned', 'wrote')
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+routing_state = ContextVar('routing_state', default=None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'REPLICA_DATABASES', [])
+        if not replicas or model._meta.app_label not in ROUTED_APP_LABELS:
+            return None
+        state = routing_state.get()
+        if state is None or state.pinned:
+            return 'default'
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            # Read-after-write: the rest of this request reads the primary
+            state.pinned = state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary's rows
+        return True
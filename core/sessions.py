@@ -0,0 +1,130 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+# Session engine: Django's cached_db (database as the source of truth, the
+# shared cache in front of it) plus an optional in-process LRU in front of
+# both, so a signed-in request can read its session without a query or a
+# cache round trip. Local entries live for SESSION_LOCAL_CACHE['TTL'] seconds
+# and another worker's logout never reaches them, so settings only allow the
+# LRU when one process serves every request. Writes go through to all layers.
+
+DEFAULTS = {
+    'SIZE': 10000,  # sessions kept per process
+    'TTL': 0,  # seconds; 0 turns the local layer off
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'SESSION_LOCAL_CACHE', {}))
+    return config
+
+
+class LocalSessionCache:
+    """Thread-safe LRU of session key -> (expires at, data)."""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+        # Callers modify the session dict in place; never hand out the cached one
+        return copy.deepcopy(entry[1])
+
+    def set(self, key, data):
+        config = get_config()
+        if not config['TTL']:
+            return
+        entry = (time.monotonic() + config['TTL'], copy.deepcopy(data))
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > config['SIZE']:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_cache = LocalSessionCache()
+
+
+class SessionStore(CachedDBStore):
+    def load(self):
+        data = local_cache.get(self._session_key) if self._session_key else None
+        if data is None:
+            data = super().load()
+            if data and self._session_key:
+                local_cache.set(self._session_key, data)
+        return data
+
+    async def aload(self):
+        data = local_cache.get(self._session_key) if self._session_key else None
+        if data is None:
+            data = await super().aload()
+            if data and self._session_key:
+                local_cache.set(self._session_key, data)
+        return data
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        local_cache.set(self.session_key, self._session)
+
+    async def asave(self, must_create=False):
+        await super().asave(must_create)
+        local_cache.set(self.session_key, self._session)
+
+    def delete(self, session_key=None):
+        local_cache.delete(session_key or self.session_key)
+        super().delete(session_key)
+
+    async def adelete(self, session_key=None):
+        local_cache.delete(session_key or self.session_key)
+        await super().adelete(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        # `clearsessions` sweeps in batches too, instead of one table-wide DELETE
+        sweep_expired()
+
+
+def sweep_expired(batch_size=1000, pause=0.0):
+    """
+    Delete sessions that expired before now in batches of ``batch_size``,
+    each its own short transaction, sleeping ``pause`` seconds in between.
+    Returns the number deleted.
+    """
+    now = timezone.now()
+    total = 0
+    while True:
+        # Walks the expire_date index from the oldest session
+        keys = list(
+            Session.objects.filter(expire_date__lt=now).order_by('expire_date')
+            .values_list('session_key', flat=True)[:batch_size]
+        )
+        if not keys:
+            return total
+        # Re-check the expiry: a session renewed since it was read is kept
+        total += Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()[0]
+        if pause:
+            time.sleep(pause)
@@ -1,5 +1,7 @@
 import os
 from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # 1. Base Directory Definition
@@ -24,9 +26,18 @@ INSTALLED_APPS = [
     'tasks', # Your Secure CRUD module
 ]
 
+# Set by core/asgi.py. Under ASGI every middleware must be async-capable: a
+# sync-only one (such as WhiteNoise) runs the rest of the request through a
+# single thread per request, so the reverse proxy serves static files instead.
+ASGI = os.getenv('DJANGO_ASGI', 'False') == 'True'
+# Native async CRUD views (tasks/async_views.py); defaults to on under ASGI
+TASK_ASYNC_VIEWS = os.getenv('TASK_ASYNC_VIEWS', str(ASGI)) == 'True'
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',  # MUST BE #1
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.PerformanceMiddleware',  # Request timing, SQL and template metrics
+    'core.middleware.ReplicaPinningMiddleware',  # Read-your-writes with read replicas
+    *([] if ASGI else ['whitenoise.middleware.WhiteNoiseMiddleware']),
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -35,13 +46,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware', # MUST BE HERE
 ]
 
+# Server-Timing header with app/db/template durations (see core/middleware.py).
+# Every client can read it, so it is off unless DEBUG is on or it is asked for.
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)) == 'True'
+
 # Pathing corrected for your folder named 'core'
 ROOT_URLCONF = 'core.urls'
 WSGI_APPLICATION = 'core.wsgi.application'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.templating.TimedDjangoTemplates',  # DjangoTemplates + render timing
         'DIRS': [BASE_DIR / 'core'], # Points to the folder containing your .html files
         'APP_DIRS': True,
         'OPTIONS': {
@@ -56,24 +71,74 @@ TEMPLATES = [
 ]
 
 # 5. Database Configuration
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
 DATABASES = {
     'default': {
-        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'ENGINE': DB_ENGINE,
         'NAME': os.getenv('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
         'USER': os.getenv('DB_USER', ''),
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', ''),
         'PORT': os.getenv('DB_PORT', ''),
+        # Persistent connections: reuse for up to N seconds, checked before reuse.
+        # Not under ASGI: every sync_to_async thread and long-lived stream
+        # (the change feed) would keep its own connection open.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0' if ASGI else '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'OPTIONS': {},
+        # Test/benchmark database; SQLite defaults to in-memory
+        'TEST': {'NAME': os.getenv('DB_TEST_NAME') or None},
+    }
+}
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    # Take the write lock at BEGIN so concurrent writers queue on busy_timeout
+    # instead of failing when upgrading a read transaction
+    DATABASES['default']['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+
+# Read replicas: DB_REPLICAS is a comma-separated list of replica NAMEs for
+# SQLite (e.g. two local files) or HOSTs for other engines; everything else
+# is copied from the primary. Reads of the tasks and admin apps are spread
+# over replicas by core.routers.ReplicaRouter.
+REPLICA_DATABASES = []
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME' if DB_ENGINE == 'django.db.backends.sqlite3' else 'HOST': replica.strip(),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
     }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter'] if REPLICA_DATABASES else []
+# Seconds a client keeps reading the primary after one of its writes
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '5'))
+
+# Applied on every new SQLite connection (see core/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'temp_store': 'MEMORY',
 }
 
 # 6. Password Validation & Hashing
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'core.hashers.TunedArgon2PasswordHasher',  # Argon2 tuned by ARGON2 below
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
 ]
+# Argon2 cost (see core/hashers.py); `manage.py calibrate_argon2` suggests
+# values for this host. Changing them re-hashes each password at its next login.
+ARGON2 = {
+    'TIME_COST': int(os.getenv('ARGON2_TIME_COST', '2')),
+    'MEMORY_COST': int(os.getenv('ARGON2_MEMORY_COST', '102400')),  # KiB
+    'PARALLELISM': int(os.getenv('ARGON2_PARALLELISM', '8')),
+    'THREADS': int(os.getenv('PASSWORD_HASHING_THREADS', '0')) or None,  # ASGI pool; default CPU count
+}
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -105,6 +170,19 @@ USE_I18N = True
 USE_TZ = True
 
 # 7. Authentication & Session Management
+AUTHENTICATION_BACKENDS = [
+    'tasks.throttle.LoginThrottleBackend',  # MUST BE FIRST: rejects before hashing
+    'tasks.rbac.CachedModelBackend',  # ModelBackend with cross-request permission caching
+]
+# Seconds a user's permission set stays cached (see tasks/rbac.py)
+RBAC_CACHE_TIMEOUT = int(os.getenv('RBAC_CACHE_TIMEOUT', '300'))
+LOGIN_THROTTLE = {
+    'STORE': os.getenv('LOGIN_THROTTLE_STORE', 'cache'),  # 'cache' (needs a shared cache) or 'local'
+    'WINDOW': int(os.getenv('LOGIN_THROTTLE_WINDOW', '300')),  # seconds
+    'IP_LIMIT': int(os.getenv('LOGIN_THROTTLE_IP_LIMIT', '20')),
+    'USERNAME_LIMIT': int(os.getenv('LOGIN_THROTTLE_USERNAME_LIMIT', '5')),
+}
+
 LOGIN_URL = 'login'  # Redirects to the named URL 'login'
 LOGIN_REDIRECT_URL = 'login_success_redirect'  # Redirects here after successful login
 LOGOUT_REDIRECT_URL = 'login'
@@ -117,6 +195,23 @@ CSRF_COOKIE_SAMESITE = 'Strict'
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_AGE = 1200  # 20 minutes
 
+# Session storage: db (a query per request), cached_db (database + cache +
+# optional per-process LRU, see core/sessions.py; needs a shared cache) or
+# signed_cookies (no server state, so a session cannot be revoked before it
+# expires)
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'db')
+SESSION_ENGINES = {
+    'cached_db': 'core.sessions',
+    'db': 'django.contrib.sessions.backends.db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_LOCAL_CACHE = {
+    'SIZE': int(os.getenv('SESSION_LOCAL_CACHE_SIZE', '10000')),
+    # Seconds a session stays in this process; 0 (off) unless CACHE_SINGLE_PROCESS
+    'TTL': int(os.getenv('SESSION_LOCAL_CACHE_TTL', '0')),
+}
+
 # 8. Security Headers
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -135,22 +230,109 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache: locmem (per process), file (shared on one host) or redis (shared).
+# Features invalidated on write skip a per-process cache unless
+# CACHE_SINGLE_PROCESS says one process serves every request (see core/caches.py)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_LOCATIONS = {
+    'locmem': 'task-manager',
+    'file': str(BASE_DIR / '.cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+    }
+}
+CACHE_SINGLE_PROCESS = os.getenv('CACHE_SINGLE_PROCESS', 'False') == 'True'
+
+# A logout must reach every worker: a per-process cache, or the per-process
+# session LRU, would keep serving the session everywhere else
+if SESSION_BACKEND == 'cached_db' and not CACHE_SINGLE_PROCESS:
+    if CACHE_BACKEND not in ('file', 'redis'):
+        raise ImproperlyConfigured(
+            "SESSION_BACKEND=cached_db needs a shared cache: set CACHE_BACKEND to 'file' or 'redis'."
+        )
+    if SESSION_LOCAL_CACHE['TTL']:
+        raise ImproperlyConfigured(
+            "SESSION_LOCAL_CACHE_TTL keeps sessions in each worker's memory; "
+            "set it to 0 unless CACHE_SINGLE_PROCESS is set."
+        )
+
+# Rendered task table fragments (see tasks/fragment_cache.py)
+TASK_LIST_CACHE = 'default'
+TASK_LIST_CACHE_TIMEOUT = int(os.getenv('TASK_LIST_CACHE_TIMEOUT', '600'))
+
+# Seconds a user's task counters stay cached (see tasks/stats.py)
+TASK_STATS_CACHE_TIMEOUT = int(os.getenv('TASK_STATS_CACHE_TIMEOUT', '300'))
+
+# Days a deleted task stays restorable before purge_tasks removes it (see tasks/trash.py)
+TASK_TRASH_RETENTION_DAYS = int(os.getenv('TASK_TRASH_RETENTION_DAYS', '30'))
+
+# Task change feed: long-poll / SSE at /tasks/api/changes/ (see tasks/changes.py)
+TASK_CHANGE_FEED = {
+    'MAX_WAIT': int(os.getenv('TASK_CHANGE_FEED_MAX_WAIT', '25')),  # long-poll seconds (ASGI only)
+    'POLL_INTERVAL': float(os.getenv('TASK_CHANGE_FEED_POLL_INTERVAL', '1.0')),
+    'STREAM_SECONDS': int(os.getenv('TASK_CHANGE_FEED_STREAM_SECONDS', '300')),
+}
+TASK_CHANGE_RETENTION_DAYS = int(os.getenv('TASK_CHANGE_RETENTION_DAYS', '7'))
+
+# 10. Audit Log Buffering (see tasks/audit.py)
+AUDIT_LOG = {
+    'SYNC': os.getenv('AUDIT_LOG_SYNC', 'False') == 'True',  # Write inline, e.g. for tests
+    'BATCH_SIZE': int(os.getenv('AUDIT_LOG_BATCH_SIZE', '100')),
+    'FLUSH_INTERVAL': float(os.getenv('AUDIT_LOG_FLUSH_INTERVAL', '2.0')),
+    'SPOOL_DIR': os.getenv('AUDIT_LOG_SPOOL_DIR', str(BASE_DIR / 'audit_spool')),
+    'FSYNC': os.getenv('AUDIT_LOG_FSYNC', 'False') == 'True',
+}
+AUDIT_LOG_RETENTION_DAYS = int(os.getenv('AUDIT_LOG_RETENTION_DAYS', '90'))
+AUDIT_LOG_ARCHIVE_DIR = os.getenv('AUDIT_LOG_ARCHIVE_DIR', str(BASE_DIR / 'audit_archive'))
+
+# Request threads only enqueue log records; a listener thread formats them
+# and writes JSON lines to security.log (rotated by size and age, gzipped
+# backups) and the console. See core/logs.py.
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'handlers': {
-        'file': {
+        'pipeline': {
+            '()': 'core.logs.QueueingHandler',
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': 'security.log',
-        },
-        'console': {
-            'class': 'logging.StreamHandler',
+            'queue_size': int(os.getenv('LOG_QUEUE_SIZE', '10000')),
+            'sinks': [
+                {
+                    'class': 'core.logs.RotatingJSONFileHandler',
+                    'filename': os.getenv('SECURITY_LOG_FILE', 'security.log'),
+                    'max_bytes': int(os.getenv('SECURITY_LOG_MAX_BYTES', str(50 * 2 ** 20))),
+                    'interval': int(os.getenv('SECURITY_LOG_ROTATE_SECONDS', '86400')),
+                    'backup_count': int(os.getenv('SECURITY_LOG_BACKUPS', '14')),
+                },
+                {
+                    'class': 'logging.StreamHandler',
+                },
+            ],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['file', 'console'],
+            'handlers': ['pipeline'],
+            'level': 'INFO',
+            'propagate': True,
+        },
+        # Security events from the app (failed logins, registrations, ...)
+        'tasks': {
+            'handlers': ['pipeline'],
+            'level': 'INFO',
+            'propagate': True,
+        },
+        'core': {
+            'handlers': ['pipeline'],
             'level': 'INFO',
             'propagate': True,
         },
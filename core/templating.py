@@ -0,0 +1,33 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import current_timings
+
+
+class TimedTemplate(Template):
+    """Adds each top-level render to the current request's template time."""
+
+    def render(self, context=None, request=None):
+        timings = current_timings.get()
+        # Templates rendered from inside another render are already counted
+        if timings is None or timings.template_depth:
+            return super().render(context, request)
+        timings.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_seconds += time.perf_counter() - start
+            timings.template_depth -= 1
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The stock Django template engine, instrumented for PerformanceMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
+from core.metrics import metrics_view
 from tasks.views import register, login_success_redirect, custom_400, custom_403, custom_404, custom_500, profile
 
 urlpatterns = [
@@ -27,6 +28,7 @@ urlpatterns = [
     path('profile/', profile, name='profile'),
     path('login-redirect/', login_success_redirect, name='login_success_redirect'),
     path('tasks/', include('tasks.urls')),
+    path('metrics/', metrics_view, name='metrics'),  # Prometheus, staff only
 ]
 
 # Custom Error Handlers (OWASP ASVS V7)
@@ -2,9 +2,13 @@ import re
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 
+# Compiled once at import; validate() runs on every password change
+DIGIT = re.compile(r'\d')
+SPECIAL_CHARACTER = re.compile(r'[()[\]{}|\\`~!@#$%^&*_\-+=;:\'",<>./?]')
+
 class NumberValidator:
     def validate(self, password, user=None):
-        if not re.search(r'\d', password):
+        if not DIGIT.search(password):
             raise ValidationError(
                 _("The password must contain at least 1 digit (0-9)."),
                 code='password_no_number',
@@ -15,7 +19,7 @@ class NumberValidator:
 
 class SpecialCharacterValidator:
     def validate(self, password, user=None):
-        if not re.search(r'[()[\]{}|\\`~!@#$%^&*_\-+=;:\'",<>./?]', password):
+        if not SPECIAL_CHARACTER.search(password):
             raise ValidationError(
                 _("The password must contain at least 1 special character."),
                 code='password_no_symbol',
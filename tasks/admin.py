@@ -1,26 +1,188 @@
+import json
+
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from django.utils.text import capfirst
 from .models import Task, AuditLog, AdminActionLog
+from .search import get_search_backend
+from .trash import move_to_trash, schedule_account_removal
 
 admin.site.site_url = None  # Remove "View site" link
 
+
+def estimate_count(queryset):
+    """Row estimate from the PostgreSQL planner, or None where there is none."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts at most EXACT_COUNT_LIMIT + 1 rows (COUNT over a LIMIT subquery, on
+    every backend) and trusts the planner's estimate beyond that, so large
+    changelists never run COUNT(*) over millions of rows.
+
+    Without a planner estimate (SQLite) a larger result counts as
+    EXACT_COUNT_LIMIT + 1 rows: the pages cover that many, and filters or
+    search narrow the rest. Both queries run on the database serving the
+    page, so the count describes the rows shown.
+    """
+
+    EXACT_COUNT_LIMIT = 10_000
+
+    @cached_property
+    def count(self):
+        capped = self.object_list.order_by()[:self.EXACT_COUNT_LIMIT + 1].count()
+        if capped <= self.EXACT_COUNT_LIMIT:
+            return capped
+        return max(estimate_count(self.object_list) or 0, capped)
+
+
+class OwnerAutocompleteFilter(admin.SimpleListFilter):
+    """Owner filter backed by the admin's user autocomplete instead of listing every user."""
+    title = 'owner'
+    parameter_name = 'owner__id__exact'
+    template = 'admin/tasks/autocomplete_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value is None:
+            return queryset
+        if not (value.isascii() and value.isdigit()):
+            raise IncorrectLookupParameters(f"Invalid owner id {value!r}.")
+        return queryset.filter(owner_id=int(value))
+
+    def choices(self, changelist):
+        # Only the "All" link; the selected owner is rendered by the widget
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(remove=[self.parameter_name]),
+            'display': 'All',
+        }
+        self.form = owner_filter_form(self.parameter_name, self.value())
+        # Keep the other active filters when the owner form is submitted
+        self.hidden_params = [
+            (key, value)
+            for key, values in changelist.filter_params.items() if key != self.parameter_name
+            for value in values
+        ]
+
+
+def owner_filter_form(name, value):
+    field = Task._meta.get_field('owner')
+    form_class = type('OwnerFilterForm', (forms.Form,), {
+        name: forms.ModelChoiceField(
+            User.objects.all(), required=False, label='',
+            widget=AutocompleteSelect(field, admin.site, attrs={'style': 'width: 100%'}),
+        ),
+    })
+    return form_class({name: value} if value else None)
+
+
+class TaskChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # Rows and actions leave description unloaded; the change form still reads it
+        return super().get_queryset(request, exclude_parameters).for_list()
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     # This controls which columns are visible in the admin list view
-    list_display = ('title', 'owner', 'is_completed', 'created_at')
-    
+    list_display = ('title', 'owner', 'is_completed', 'priority', 'due_at', 'created_at')
+    # One JOIN instead of a User query per row
+    list_select_related = ('owner',)
+
     # This adds a sidebar filter for easy navigation
-    list_filter = ('is_completed', 'owner', 'created_at')
-    
+    list_filter = ('is_completed', OwnerAutocompleteFilter, 'created_at')
+    autocomplete_fields = ('owner',)
+
     # This adds a search bar to the admin page
     search_fields = ('title', 'description')
 
+    # No COUNT(*) of the whole table, and estimated counts for big results
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    @property
+    def media(self):
+        return super().media + AutocompleteSelect(Task._meta.get_field('owner'), self.admin_site).media
+
+    def get_changelist(self, request, **kwargs):
+        return TaskChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index (tasks/search.py) rather than icontains scans
+        if not search_term.strip():
+            return queryset, False
+        backend = get_search_backend()
+        if ORDER_VAR in request.GET:
+            return backend.filter(queryset, search_term), False
+        # Best matches first until a column is picked
+        return backend.ranked(queryset, search_term), False
+
+    # Deleting moves tasks to the trash (tasks/trash.py); purge_tasks removes them later
+    def delete_model(self, request, obj):
+        move_to_trash(Task.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        move_to_trash(queryset)
+
+admin.site.unregister(User)
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    # Deleting an account deactivates it at once; purge_tasks then deletes its
+    # tasks in batches and the user last, instead of one long cascade here
+    def delete_model(self, request, obj):
+        schedule_account_removal(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            schedule_account_removal(user)
+
+    def get_deleted_objects(self, objs, request):
+        # The confirmation page (delete view and "delete selected") lists the
+        # accounts without collecting their cascade: nothing is deleted now
+        users = list(objs)
+        label = capfirst(self.opts.verbose_name)
+        to_delete = [
+            format_html('{}: {} (deactivated now, tasks purged later in batches)', label, user)
+            for user in users
+        ]
+        return to_delete, {self.opts.verbose_name_plural: len(users)}, set(), []
+
 @admin.register(AdminActionLog)
 class AdminActionLogAdmin(admin.ModelAdmin):
     """Displays Django's internal 'Recent Actions' in the admin panel."""
     list_display = ('action_time', 'user', 'content_type', 'object_repr', 'action_flag', 'change_message')
+    list_select_related = ('user', 'content_type')
     list_filter = ('action_flag', 'content_type', 'action_time')
     search_fields = ('object_repr', 'change_message', 'user__username')
-    
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
     def has_add_permission(self, request): return False
     def has_change_permission(self, request, obj=None): return False
     def has_delete_permission(self, request, obj=None): return False
@@ -28,9 +190,13 @@ class AdminActionLogAdmin(admin.ModelAdmin):
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ('timestamp', 'get_user_info', 'action', 'ip_address', 'details')
+    # get_user_info reads obj.user on every row
+    list_select_related = ('user',)
     list_filter = ('action', 'timestamp')
     search_fields = ('user__username', 'ip_address')
     readonly_fields = ('user', 'action', 'ip_address', 'user_agent', 'details', 'timestamp')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
     def get_user_info(self, obj):
         if obj.user:
@@ -40,4 +206,4 @@ class AuditLogAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request): return False
     def has_change_permission(self, request, obj=None): return False
-    def has_delete_permission(self, request, obj=None): return False
\ No newline at end of file
+    def has_delete_permission(self, request, obj=None): return False
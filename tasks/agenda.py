@@ -0,0 +1,49 @@
+import datetime
+
+from django.utils import timezone
+
+from .models import Task
+
+# Agenda: the user's open tasks that are overdue, due today and due later this
+# week (weeks start on Monday, days follow the active time zone).
+# Each bucket is one range scan of task_owner_open_due_idx (owner, due_at over
+# open tasks with a due date), already in due order, and reads at most
+# AGENDA_LIMIT + 1 rows.
+
+AGENDA_LIMIT = 50
+SECTIONS = (
+    ('overdue', 'Overdue'),
+    ('today', 'Today'),
+    ('week', 'This week'),
+)
+
+
+def bounds(now=None):
+    """Return {section: (start, end)}; start is inclusive, end exclusive, None is open."""
+    now = now or timezone.now()
+    midnight = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = midnight + datetime.timedelta(days=1)
+    next_monday = midnight + datetime.timedelta(days=7 - midnight.weekday())
+    return {
+        'overdue': (None, now),
+        'today': (now, tomorrow),
+        'week': (tomorrow, next_monday),
+    }
+
+
+def section_queryset(owner_id, start, end):
+    tasks = Task.objects.filter(owner_id=owner_id, is_completed=False, due_at__lt=end)
+    if start is not None:
+        tasks = tasks.filter(due_at__gte=start)
+    return tasks.for_list().order_by('due_at', 'id')
+
+
+def agenda_sections(owner_id, now=None, limit=AGENDA_LIMIT):
+    """[{'key', 'label', 'tasks', 'more'}] for the overdue, today and this week buckets."""
+    ranges = bounds(now)
+    sections = []
+    for key, label in SECTIONS:
+        # One row past the limit tells whether the bucket has more
+        tasks = list(section_queryset(owner_id, *ranges[key])[:limit + 1])
+        sections.append({'key': key, 'label': label, 'tasks': tasks[:limit], 'more': len(tasks) > limit})
+    return sections
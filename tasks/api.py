@@ -0,0 +1,217 @@
+import json
+import zlib
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_http_methods
+
+from .forms import TaskForm
+from .models import Task
+from .pagination import InvalidCursor, get_page_size, paginate
+from .rbac import deletable_tasks, editable_tasks
+from .search import get_search_backend
+from .stats import get_task_stats
+from .trash import move_to_trash
+
+# JSON API over Task.
+# Owner filtering mirrors the HTML views. Validators on GET are cheap:
+# the list ETag comes from the per-user counters (tasks/stats.py; cached only
+# in a cache every worker shares, so a write elsewhere always changes it) and
+# the detail ETag from a single-column lookup, so an unchanged resource is
+# answered with 304 Not Modified before any row is serialized.
+
+API_FIELDS = ('id', 'title', 'description', 'is_completed', 'priority', 'due_at', 'created_at', 'updated_at')
+
+
+def api_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder)
+
+
+def api_error(message, status=400):
+    return api_response({'error': message}, status=status)
+
+
+def api_login_required(view_func):
+    """Like login_required, but answers 401 instead of redirecting to the login page."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return api_error("Authentication required.", status=401)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def parse_fields(request):
+    """Sparse fieldsets: ?fields=title,is_completed (unknown names raise ValueError)."""
+    value = request.GET.get('fields')
+    if not value:
+        return API_FIELDS
+    fields = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = set(fields) - set(API_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}.")
+    return fields
+
+
+def parse_body(request):
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        raise ValueError("Request body must be valid JSON.")
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+    return data
+
+
+def serialize(task, fields=API_FIELDS):
+    return {field: getattr(task, field) for field in fields}
+
+
+# IDOR Prevention: the same scoping rules as task_list / edit_task / delete_task
+def readable_tasks(user):
+    return editable_tasks(user)
+
+
+def deletable_task(user, pk):
+    return get_object_or_404(deletable_tasks(user), pk=pk)
+
+
+# Conditional GET validators
+def list_etag(request):
+    if not request.user.is_authenticated:
+        return None
+    stats = get_task_stats(request.user.pk)
+    # Different query strings are different representations of the list
+    variant = zlib.crc32(request.GET.urlencode().encode())
+    return (
+        f'W/"tasks-{request.user.pk}-{stats["total"]}-{stats["completed"]}-'
+        f'{stats["last_modified"].timestamp()}-{variant:x}"'
+    )
+
+
+def list_last_modified(request):
+    if not request.user.is_authenticated:
+        return None
+    return get_task_stats(request.user.pk)['last_modified']
+
+
+def _updated_at(request, pk):
+    # Shared by both validators so the lookup runs once per request
+    if not request.user.is_authenticated:
+        return None
+    if not hasattr(request, '_task_updated_at'):
+        request._task_updated_at = (
+            readable_tasks(request.user).filter(pk=pk).values_list('updated_at', flat=True).first()
+        )
+    return request._task_updated_at
+
+
+def detail_etag(request, pk):
+    updated_at = _updated_at(request, pk)
+    return f'W/"task-{pk}-{updated_at.timestamp()}"' if updated_at else None
+
+
+def detail_last_modified(request, pk):
+    return _updated_at(request, pk)
+
+
+@api_login_required
+@require_http_methods(['GET', 'HEAD', 'POST'])
+@condition(etag_func=list_etag, last_modified_func=list_last_modified)
+def task_list(request):
+    if request.method == 'POST':
+        return create_task(request)
+
+    try:
+        fields = parse_fields(request)
+    except ValueError as exc:
+        return api_error(str(exc))
+
+    # Page with values() so no model instances are built; the cursor needs
+    # created_at and id even when the client did not ask for them.
+    tasks = Task.objects.filter(owner=request.user)
+    query = request.GET.get('q', '')
+    if query:
+        # Search results are the page_size best matches, with no cursors
+        ranked = get_search_backend().ranked(tasks, query).values(*fields)
+        return api_response({
+            'results': list(ranked[:get_page_size(request.GET.get('page_size'))]),
+            'next': None,
+            'previous': None,
+        })
+    try:
+        page = paginate(
+            tasks.values(*dict.fromkeys((*fields, 'created_at', 'id'))),
+            cursor=request.GET.get('cursor'),
+            page_size=request.GET.get('page_size'),
+        )
+    except InvalidCursor as exc:
+        return api_error(str(exc))
+
+    return api_response({
+        'results': [{field: row[field] for field in fields} for row in page],
+        'next': page.next_cursor,
+        'previous': page.prev_cursor,
+    })
+
+
+def create_task(request):
+    try:
+        data = parse_body(request)
+    except ValueError as exc:
+        return api_error(str(exc))
+    form = TaskForm(data)
+    if not form.is_valid():
+        return api_response({'errors': form.errors.get_json_data()}, status=400)
+    task = form.save(commit=False)
+    task.owner = request.user
+    if 'is_completed' in data:
+        if not isinstance(data['is_completed'], bool):
+            return api_error("'is_completed' must be a boolean.")
+        task.is_completed = data['is_completed']
+    task.save()
+    return api_response(serialize(task), status=201)
+
+
+@api_login_required
+@require_http_methods(['GET', 'HEAD', 'PUT', 'PATCH', 'DELETE'])
+@condition(etag_func=detail_etag, last_modified_func=detail_last_modified)
+def task_detail(request, pk):
+    if request.method == 'DELETE':
+        task = deletable_task(request.user, pk)
+        move_to_trash(Task.objects.filter(pk=task.pk))
+        return HttpResponse(status=204)
+
+    task = get_object_or_404(readable_tasks(request.user), pk=pk)
+    if request.method in ('PUT', 'PATCH'):
+        return update_task(request, task)
+
+    try:
+        fields = parse_fields(request)
+    except ValueError as exc:
+        return api_error(str(exc))
+    return api_response(serialize(task, fields))
+
+
+def update_task(request, task):
+    try:
+        data = parse_body(request)
+    except ValueError as exc:
+        return api_error(str(exc))
+    if request.method == 'PATCH':
+        # Partial update: missing form fields keep their current values
+        data = {
+            'title': task.title, 'description': task.description,
+            'due_at': task.due_at, 'priority': task.priority, **data,
+        }
+    form = TaskForm(data, instance=task)
+    if not form.is_valid():
+        return api_response({'errors': form.errors.get_json_data()}, status=400)
+    if 'is_completed' in data:
+        if not isinstance(data['is_completed'], bool):
+            return api_error("'is_completed' must be a boolean.")
+        task.is_completed = data['is_completed']
+    form.save()
+    return api_response(serialize(task))
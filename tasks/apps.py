@@ -6,3 +6,4 @@ class TasksConfig(AppConfig):
 
     def ready(self):
         import tasks.signals
+        import core.db  # SQLite connection pragmas, SQL timing
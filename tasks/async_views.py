@@ -0,0 +1,201 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.shortcuts import render, redirect, aget_object_or_404
+from django.template.loader import render_to_string
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied, BadRequest
+from django.views.decorators.http import require_GET
+from .api import api_error, api_response
+from .models import Task
+from .forms import TaskForm
+from .pagination import apaginate, InvalidCursor, KeysetPage
+from .search import SEARCH_LIMIT, aget_search_backend
+from .stats import aget_task_stats
+from . import changes, fragment_cache, rbac, trash
+import asyncio
+import json
+
+# Native async versions of the task CRUD views, served under ASGI
+# (TASK_ASYNC_VIEWS, see tasks/urls.py). Same access rules as tasks/views.py;
+# the ORM is used through its async API so a request waiting on the database
+# does not hold a worker thread. The change feed lives here too: waiting for
+# changes is only cheap on the event loop.
+
+
+async def get_user(request):
+    user = await request.auser()
+    # Templates and context processors read request.user; resolving the lazy
+    # object on the event loop would run a synchronous query.
+    request.user = user
+    return user
+
+
+
+# 1. READ: List tasks (Access Control implemented)
+@login_required
+async def task_list(request):
+    user = await get_user(request)
+    # Restrict access: Admins go to the Admin Panel, not the Task List
+    if user.is_staff:
+        return redirect('admin:index')
+
+    query = request.GET.get('q', '')
+    cursor = request.GET.get('cursor')
+
+    async def render_table():
+        # IDOR Prevention: Always start by filtering by the current user
+        tasks = Task.objects.filter(owner=user).for_list()
+
+        if query:
+            # Parameterized, index-backed full-text search, best matches
+            # first; a search is a single page (see tasks/search.py)
+            ranked = (await aget_search_backend()).ranked(tasks, query)[:SEARCH_LIMIT]
+            page = KeysetPage([task async for task in ranked], None, None)
+        else:
+            # Keyset pagination: never render the whole task set at once
+            try:
+                page = await apaginate(tasks, cursor=cursor)
+            except InvalidCursor:
+                raise BadRequest("Invalid page cursor.")
+        return render_to_string('tasks/task_table.html', {'page': page, 'query': query})
+
+    # The rendered table is cached per user and query (see tasks/fragment_cache.py)
+    task_table = await fragment_cache.aget_or_render(user.pk, {'q': query, 'cursor': cursor}, render_table)
+
+    return render(request, 'tasks/task_list.html', {
+        'task_table': task_table, 'query': query, 'stats': await aget_task_stats(user.pk),
+    })
+
+# 2. CREATE: Add new task (Input Validation via Forms)
+@login_required
+async def create_task(request):
+    user = await get_user(request)
+    if request.method == "POST":
+        form = TaskForm(request.POST)
+        if form.is_valid():
+            task = form.save(commit=False)
+            task.owner = user
+            await task.asave()
+            return redirect('task_list')
+    else:
+        form = TaskForm()
+    return render(request, 'tasks/task_form.html', {'form': form})
+
+# 3. UPDATE: Edit task (Ownership Verification)
+@login_required
+async def edit_task(request, pk):
+    user = await get_user(request)
+    # IDOR Prevention: Use a filtered queryset to ensure users can only access their own tasks
+    # (or every task, with the global change permission; see tasks/rbac.py)
+    task = await aget_object_or_404(await rbac.aeditable_tasks(user), pk=pk)
+
+    if request.method == "POST":
+        form = TaskForm(request.POST, instance=task)
+        if form.is_valid():
+            await form.instance.asave()
+            return redirect('task_list')
+    else:
+        form = TaskForm(instance=task)
+    return render(request, 'tasks/task_form.html', {'form': form})
+
+# 4. DELETE: Secure deletion
+@login_required
+async def delete_task(request, pk):
+    user = await get_user(request)
+    task = await aget_object_or_404(Task, pk=pk)
+
+    # Granular RBAC: Check if user is owner OR has the global delete permission
+    if not await rbac.acan_delete(user, task):
+        raise PermissionDenied
+
+    if request.method == "POST":
+        # Soft delete: restorable from the trash until purge_tasks removes it
+        await sync_to_async(trash.move_to_trash)(Task.objects.filter(pk=task.pk))
+        return redirect('task_list')
+    return render(request, 'tasks/task_confirm_delete.html', {'task': task})
+
+# 5. FEED: The user's task changes after a cursor (see tasks/changes.py)
+# GET ?since=<seq>[&wait=<seconds>] answers JSON, long-polling when nothing is
+# new yet; with "Accept: text/event-stream" it streams server-sent events and
+# resumes from Last-Event-ID. Without a cursor it returns the current one.
+@require_GET
+async def task_changes(request):
+    user = await get_user(request)
+    if not user.is_authenticated:
+        return api_error("Authentication required.", status=401)
+
+    config = changes.get_config()
+    stream = 'text/event-stream' in request.headers.get('Accept', '')
+    if stream and not settings.ASGI:
+        # Under WSGI each open stream would pin a worker process or thread
+        return api_error("Streaming is only available under ASGI.", status=406)
+
+    since = (request.headers.get('Last-Event-ID') if stream else None) or request.GET.get('since')
+    if since is not None:
+        if not (since.isascii() and since.isdigit()):
+            return api_error("'since' must be a non-negative integer.")
+        since = int(since)
+        if await sync_to_async(changes.is_expired)(since):
+            return api_response({
+                'error': "Cursor is older than the feed's retention; reload the task list.",
+                'cursor': await sync_to_async(changes.latest)(user.pk),
+            }, status=410)
+    else:
+        since = await sync_to_async(changes.latest)(user.pk)
+        if not stream:
+            return api_response({'changes': [], 'cursor': since, 'more': False})
+
+    if stream:
+        response = StreamingHttpResponse(event_stream(user.pk, since, config), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering events
+        return response
+
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        wait = -1
+    if not wait >= 0:  # also rejects NaN
+        return api_error("'wait' must be a non-negative number of seconds.")
+    wait = min(wait, config['MAX_WAIT']) if settings.ASGI else 0
+
+    batch = await wait_for_changes(user.pk, since, wait, config)
+    return api_response({
+        'changes': batch,
+        'cursor': batch[-1]['seq'] if batch else since,
+        'more': len(batch) >= config['MAX_BATCH'],
+    })
+
+
+async def wait_for_changes(owner_id, since, wait, config):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        batch = await sync_to_async(changes.poll)(owner_id, since)
+        if batch or loop.time() >= deadline:
+            return batch
+        await asyncio.sleep(min(config['POLL_INTERVAL'], max(deadline - loop.time(), 0)))
+
+
+async def event_stream(owner_id, since, config):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + config['STREAM_SECONDS']
+    last_sent = loop.time()
+    yield 'retry: 3000\n\n'
+    while loop.time() < end:
+        batch = await sync_to_async(changes.poll)(owner_id, since)
+        for change in batch:
+            data = json.dumps(change, cls=DjangoJSONEncoder)
+            yield f"id: {change['seq']}\nevent: task\ndata: {data}\n\n"
+        if batch:
+            since = batch[-1]['seq']
+            last_sent = loop.time()
+            if len(batch) >= config['MAX_BATCH']:
+                continue
+        elif loop.time() - last_sent >= config['HEARTBEAT']:
+            # Comment line: keeps proxies from timing out an idle stream
+            yield ': keep-alive\n\n'
+            last_sent = loop.time()
+        await asyncio.sleep(config['POLL_INTERVAL'])
@@ -0,0 +1,230 @@
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Buffered writer for security events.
+# Auth signals append an event to a local spool file (so it survives a crash)
+# and to an in-memory buffer; a background thread writes the buffer with a
+# single bulk_create once it is big enough or old enough. Delivery is
+# at-least-once: a crash between the INSERT and the spool cleanup replays
+# that batch on the next start.
+# Each sink holds an flock on its own lock file for as long as it runs; a
+# spool whose lock is gone belongs to a process that exited, and is replayed
+# by the next sink's thread, never inside the request that started it.
+
+DEFAULTS = {
+    'SYNC': False,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,
+    'SPOOL_DIR': None,
+    'FSYNC': False,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'AUDIT_LOG', {}))
+    if not config['SPOOL_DIR']:
+        config['SPOOL_DIR'] = Path(settings.BASE_DIR) / 'audit_spool'
+    return config
+
+
+class BufferedAuditSink:
+    def __init__(self, batch_size, flush_interval, spool_dir, fsync=False):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        # One spool per sink so workers never interleave or steal lines; the
+        # start time keeps a reused pid from colliding with a dead sink's files
+        self.spool_dir = Path(spool_dir)
+        name = f'audit-{os.getpid()}-{time.time_ns():x}'
+        self.lock_path = self.spool_dir / f'{name}.lock'
+        self.spool_path = self.spool_dir / f'{name}.jsonl'
+        self.flushing_path = self.spool_path.with_name(self.spool_path.name + '.flushing')
+        self.recovering_path = self.spool_dir / f'{name}.recovering'
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._spool = None
+        self._lock_file = None
+
+    def start(self):
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        # Taken before the spool exists and held until stop()
+        self._lock_file = open(self.lock_path, 'w')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._spool = open(self.spool_path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='audit-sink', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        with self._lock:
+            self._spool.close()
+            if self.spool_path.stat().st_size == 0:
+                self.spool_path.unlink()
+        # Anything still spooled is now recoverable by other sinks
+        self.lock_path.unlink(missing_ok=True)
+        self._lock_file.close()
+
+    def record(self, event):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            # Write-ahead: the event is on disk before the request moves on
+            self._spool.write(line + '\n')
+            self._spool.flush()
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        try:
+            self._recover()
+        except Exception:
+            logger.exception("Audit spool recovery failed; the orphaned events stay on disk.")
+        finally:
+            close_old_connections()
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit sink flush failed; events remain spooled.")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                batch, self._buffer = self._buffer, []
+                # Hand the spooled lines for this batch over to a side file
+                self._spool.close()
+                os.replace(self.spool_path, self.flushing_path)
+                self._spool = open(self.spool_path, 'a', encoding='utf-8')
+            try:
+                write_events(batch)
+            except Exception:
+                with self._lock:
+                    self._buffer[:0] = batch
+                    self._requeue_flushing()
+                raise
+            self.flushing_path.unlink(missing_ok=True)
+
+    def _requeue_flushing(self):
+        # Keep failed events in the live spool so a restart still sees them
+        with open(self.flushing_path, encoding='utf-8') as flushing:
+            self._spool.write(flushing.read())
+        self._spool.flush()
+        self.flushing_path.unlink(missing_ok=True)
+
+    def _recover(self):
+        """Replay events spooled by sinks whose process exited before flushing."""
+        for lock_path in self.spool_dir.glob('audit-*.lock'):
+            if lock_path == self.lock_path:
+                continue
+            with open(lock_path, 'a') as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # its sink is running
+                # The kernel released the lock, so its process is gone
+                lock_path.unlink(missing_ok=True)
+        for path in sorted(self.spool_dir.glob('audit-*')):
+            if not path.name.endswith(('.jsonl', '.jsonl.flushing', '.recovering')):
+                continue
+            if (self.spool_dir / f"{path.name.split('.')[0]}.lock").exists():
+                continue
+            try:
+                # Atomic claim: if another sink renamed it first, skip it
+                os.replace(path, self.recovering_path)
+            except FileNotFoundError:
+                continue
+            with open(self.recovering_path, encoding='utf-8') as spool:
+                events = [json.loads(line) for line in spool if line.strip()]
+            if events:
+                logger.warning("Replaying %d spooled audit events from %s.", len(events), path.name)
+                write_events(events)
+            self.recovering_path.unlink()
+
+
+def write_events(events):
+    # A user may have been deleted since the event was queued; keep the event
+    user_ids = {event['user_id'] for event in events if event['user_id'] is not None}
+    if user_ids:
+        user_ids = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+    AuditLog.objects.bulk_create([
+        AuditLog(
+            user_id=event['user_id'] if event['user_id'] in user_ids else None,
+            action=event['action'],
+            ip_address=event['ip_address'],
+            user_agent=event['user_agent'],
+            details=event['details'],
+            timestamp=parse_datetime(event['timestamp']) if isinstance(event['timestamp'], str) else event['timestamp'],
+        )
+        for event in events
+    ])
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                config = get_config()
+                sink = BufferedAuditSink(
+                    config['BATCH_SIZE'], config['FLUSH_INTERVAL'], config['SPOOL_DIR'], config['FSYNC']
+                )
+                sink.start()
+                _sink = sink
+    return _sink
+
+
+def record_event(action, user=None, ip_address=None, user_agent='', details=''):
+    """Record a security event, buffered unless AUDIT_LOG['SYNC'] is set."""
+    event = {
+        'user_id': user.pk if user is not None else None,
+        'action': action,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+        'details': details,
+        'timestamp': timezone.now(),
+    }
+    if get_config()['SYNC']:
+        write_events([event])
+    else:
+        get_sink().record(event)
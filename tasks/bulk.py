@@ -0,0 +1,66 @@
+from django.db import router, transaction
+from django.utils import timezone
+
+from . import rbac, trash
+from .models import Task
+from .signals import tasks_bulk_changed
+from .validation import validate_rows
+
+# Bulk task operations.
+# Each operation resolves every id through one filtered queryset, applying the
+# same ownership / permission rules as edit_task and delete_task (tasks/rbac.py),
+# and then writes with a single UPDATE or batched INSERT in one transaction;
+# deleting is an UPDATE too, into the trash (tasks/trash.py).
+# Per-row model signals are skipped, so tasks_bulk_changed is sent instead.
+
+MAX_BULK_ITEMS = 1000
+CREATE_BATCH_SIZE = 500
+
+
+def editable_tasks(user, ids):
+    # Same rule as edit_task: global change permission, otherwise own tasks only
+    return rbac.editable_tasks(user).filter(pk__in=ids)
+
+
+def deletable_tasks(user, ids):
+    # Same rule as delete_task: owner OR global delete permission
+    return rbac.deletable_tasks(user).filter(pk__in=ids)
+
+
+def set_completed(user, ids, is_completed):
+    """Mark the user's accessible tasks in ``ids`` as (not) completed; returns the count."""
+    with transaction.atomic(using=router.db_for_write(Task)):
+        rows = list(editable_tasks(user, ids).values_list('pk', 'owner_id'))
+        if rows:
+            Task.objects.filter(pk__in=[pk for pk, _ in rows]).update(is_completed=is_completed, updated_at=timezone.now())
+            tasks_bulk_changed.send(sender=Task, updated=rows)
+    return len(rows)
+
+
+def delete(user, ids):
+    """Move the user's accessible tasks in ``ids`` to the trash; returns the count."""
+    return trash.move_to_trash(deletable_tasks(user, ids))
+
+
+def validate(payloads):
+    """Validate task payloads with the TaskForm rules; returns (unsaved tasks, {index: errors})."""
+    valid, errors = validate_rows(payloads)
+    return [Task(**cleaned) for _, cleaned in valid], errors
+
+
+def create(user, payloads):
+    """Create tasks for ``user``; nothing is written unless every payload is valid."""
+    tasks, errors = validate(payloads)
+    if errors:
+        return [], errors
+    for task in tasks:
+        task.owner = user
+    return insert(tasks), {}
+
+
+def insert(tasks, batch_size=CREATE_BATCH_SIZE):
+    """Write already validated, owned tasks in one transaction; returns the created tasks."""
+    with transaction.atomic(using=router.db_for_write(Task)):
+        created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+        tasks_bulk_changed.send(sender=Task, created=created)
+    return created
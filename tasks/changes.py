@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Task, TaskChange
+
+# Per-user task change feed.
+# Task signals append a TaskChange row in the same transaction as the write,
+# so the feed id is a monotonic sequence that clients use as their cursor.
+# Readers fetch "changes after N" with one index range scan on
+# (owner_id, id) and get the current values of the tasks that changed.
+
+DEFAULTS = {
+    'MAX_BATCH': 500,  # changes per response / SSE burst
+    'MAX_WAIT': 25,  # longest long-poll, in seconds
+    'POLL_INTERVAL': 1.0,  # seconds between feed checks while waiting
+    'HEARTBEAT': 15,  # SSE keep-alive comment interval
+    'STREAM_SECONDS': 300,  # SSE connections end after this; clients reconnect with Last-Event-ID
+    # Sequence ids are assigned at INSERT but become visible at COMMIT. Where
+    # writers run concurrently (not SQLite), a reader could see id N+1 before
+    # N commits and skip N; changes younger than this are held back.
+    'SETTLE': 1.0,
+}
+
+FEED_FIELDS = ('id', 'title', 'description', 'is_completed', 'priority', 'due_at', 'created_at', 'updated_at')
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'TASK_CHANGE_FEED', {}))
+    return config
+
+
+def record(owner_id, task_id, action):
+    TaskChange.objects.create(owner_id=owner_id, task_id=task_id, action=action)
+
+
+def record_many(entries):
+    """``entries`` is an iterable of (owner_id, task_id, action)."""
+    TaskChange.objects.bulk_create(
+        [TaskChange(owner_id=owner_id, task_id=task_id, action=action) for owner_id, task_id, action in entries],
+        batch_size=500,
+    )
+
+
+def latest(owner_id):
+    """The user's current cursor: the id of their newest change, or 0."""
+    return (
+        TaskChange.objects.filter(owner_id=owner_id).order_by('-id').values_list('id', flat=True).first() or 0
+    )
+
+
+def is_expired(since):
+    # Ids start at 1, so a gap below the oldest row means rows were pruned;
+    # a client whose cursor falls in it may have missed changes
+    oldest = TaskChange.objects.aggregate(oldest=Min('id'))['oldest']
+    return since > 0 and oldest is not None and since < oldest - 1
+
+
+def _settle_cutoff(config):
+    connection = connections[router.db_for_read(TaskChange)]
+    if connection.vendor == 'sqlite' or not config['SETTLE']:
+        return None
+    return timezone.now() - timedelta(seconds=config['SETTLE'])
+
+
+def fetch(owner_id, since, limit=None):
+    """Return up to ``limit`` changes after ``since``, oldest first, with current task values."""
+    config = get_config()
+    changes = TaskChange.objects.filter(owner_id=owner_id, id__gt=since).order_by('id')
+    cutoff = _settle_cutoff(config)
+    if cutoff is not None:
+        changes = changes.filter(timestamp__lt=cutoff)
+    changes = list(changes.values('id', 'task_id', 'action')[:limit or config['MAX_BATCH']])
+
+    task_ids = {change['task_id'] for change in changes if change['action'] != 'deleted'}
+    tasks = {}
+    if task_ids:
+        # Only the user's own tasks: a task moved to another owner reads as gone
+        tasks = {
+            row['id']: row
+            for row in Task.objects.filter(owner_id=owner_id, pk__in=task_ids).values(*FEED_FIELDS)
+        }
+    return [
+        {
+            'seq': change['id'],
+            'action': change['action'],
+            'task_id': change['task_id'],
+            'task': tasks.get(change['task_id']),
+        }
+        for change in changes
+    ]
+
+
+def poll(owner_id, since):
+    """
+    fetch() for a client that is waiting on the feed. The connection is closed
+    afterwards, so a long-poll or stream holds a connection only while it
+    queries, not while it sleeps between polls.
+    """
+    try:
+        return fetch(owner_id, since)
+    finally:
+        for connection in connections.all(initialized_only=True):
+            if not connection.in_atomic_block:
+                connection.close()
+
+
+def prune(days, batch_size=1000):
+    """Delete changes older than ``days``, oldest first; returns the number deleted."""
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        # The oldest rows sit at the start of the primary key, so each batch is a short scan
+        ids = list(
+            TaskChange.objects.filter(timestamp__lt=cutoff).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        TaskChange.objects.filter(id__in=ids).delete()
+        total += len(ids)
@@ -0,0 +1,104 @@
+import csv
+import datetime
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# Streaming CSV / JSONL exports.
+# Rows come from values_list().iterator() (server-side cursors on
+# PostgreSQL) and are sent in small text chunks, so memory stays flat however
+# many rows there are. Under ASGI the body is an async iterator: Django would
+# otherwise collect a synchronous one into a list before sending it.
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+TASK_FIELDS = ('id', 'title', 'description', 'is_completed', 'priority', 'due_at', 'created_at', 'updated_at')
+AUDIT_FIELDS = ('id', 'timestamp', 'action', 'user__username', 'ip_address', 'user_agent', 'details')
+
+# Leading characters that make spreadsheets evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# Values guarded with a leading quote: text that already starts with one is
+# quoted too (as spreadsheets read it), so the guard can always be undone
+GUARDED_PREFIXES = (*FORMULA_PREFIXES, "'")
+
+CHUNK_SIZE = 2000  # rows fetched per database round trip
+FLUSH_ROWS = 500  # rows per chunk written to the client
+
+
+class Echo:
+    """File-like object whose write() hands back the formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def _column(field):
+    # owner__username -> owner
+    return field.split('__')[0]
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(GUARDED_PREFIXES):
+        # Keep spreadsheets from evaluating user text as a formula
+        return "'" + value
+    return value
+
+
+def _formatter(fmt, fields):
+    columns = [_column(field) for field in fields]
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        return writer.writerow(columns), lambda row: writer.writerow([_csv_value(value) for value in row])
+    encoder = DjangoJSONEncoder()
+    return '', lambda row: encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def rows(queryset, fields, fmt):
+    head, format_row = _formatter(fmt, fields)
+    buffer = [head]
+    for row in queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+        buffer.append(format_row(row))
+        if len(buffer) >= FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    yield ''.join(buffer)
+
+
+async def arows(queryset, fields, fmt):
+    head, format_row = _formatter(fmt, fields)
+    buffer = [head]
+    # values(), not values_list(): in Django 5.1 values_list().aiterator()
+    # runs the query on the event loop and fails
+    async for row in queryset.values(*fields).aiterator(chunk_size=CHUNK_SIZE):
+        buffer.append(format_row([row[field] for field in fields]))
+        if len(buffer) >= FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    yield ''.join(buffer)
+
+
+def streaming_export(queryset, fields, fmt, name):
+    """Stream ``queryset`` (ordered by id) as an attachment in ``fmt``."""
+    queryset = queryset.order_by('id')
+    content = arows(queryset, fields, fmt) if settings.ASGI else rows(queryset, fields, fmt)
+    response = StreamingHttpResponse(content, content_type=FORMATS[fmt])
+    filename = f'{name}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def csv_unguard(value):
+    """Undo the formula guard applied by the CSV export."""
+    if isinstance(value, str) and value.startswith("'") and value[1:].startswith(GUARDED_PREFIXES):
+        return value[1:]
+    return value
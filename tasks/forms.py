@@ -1,15 +1,14 @@
 from django import forms
 from .models import Task
-import re
+from .validation import OPTIONAL_FIELDS
 
 class TaskForm(forms.ModelForm):
+    # Title characters are checked once, by the model field's validator
+    # (tasks/validation.py), when the form runs the model's clean.
+    # Due date and priority use the same field objects as the bulk and import paths.
+    due_at = OPTIONAL_FIELDS['due_at']
+    priority = OPTIONAL_FIELDS['priority']
+
     class Meta:
         model = Task
-        fields = ['title', 'description']
-
-    def clean_title(self):
-        title = self.cleaned_data.get('title')
-        # Whitelisting
-        if not re.match(r'^[a-zA-Z0-9\s]+$', title):
-            raise forms.ValidationError("Invalid characters! Only letters and numbers allowed.")
-        return title
\ No newline at end of file
+        fields = ['title', 'description', 'due_at', 'priority']
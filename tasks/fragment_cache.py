@@ -0,0 +1,119 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+from core.caches import is_shared
+
+# Per-user fragment cache for the rendered task table.
+# Keys embed a per-user version number; Task signals bump the version, which
+# orphans every cached page of that user at once (old entries simply expire).
+# A bump must reach every worker, so fragments are only cached in a shared
+# backend (file, Redis; see core/caches.py). Otherwise every request renders.
+
+VERSION_KEY = 'task_list_version:{}'
+FRAGMENT_KEY = 'task_list_fragment:{}:{}:{}'
+
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def _alias():
+    return getattr(settings, 'TASK_LIST_CACHE', 'default')
+
+
+def _cache():
+    return caches[_alias()]
+
+
+def _timeout():
+    return getattr(settings, 'TASK_LIST_CACHE_TIMEOUT', 600)
+
+
+def _count(name):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def get_counters():
+    """Hit/miss totals for this process."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+def _new_version():
+    # Never restart at a small number after eviction, which could
+    # resurrect fragments cached under an earlier version.
+    return time.time_ns() // 1000
+
+
+def get_version(user_id):
+    cache = _cache()
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(user_id):
+    cache = _cache()
+    key = VERSION_KEY.format(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _new_version(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(user_id):
+    def bump():
+        cache = _cache()
+        key = VERSION_KEY.format(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+    # Bump once the write is visible, so a concurrent miss cannot re-cache stale rows
+    transaction.on_commit(bump)
+
+
+def _digest(params):
+    return hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()
+
+
+def get_or_render(user_id, params, render):
+    """Return the cached fragment for ``params`` or store the result of ``render()``."""
+    if not is_shared(_alias()):
+        return mark_safe(render())
+    key = FRAGMENT_KEY.format(user_id, get_version(user_id), _digest(params))
+    cache = _cache()
+    html = cache.get(key)
+    if html is not None:
+        _count('hits')
+        return mark_safe(html)
+    _count('misses')
+    html = render()
+    cache.set(key, str(html), _timeout())
+    return mark_safe(html)
+
+
+async def aget_or_render(user_id, params, render):
+    """Async get_or_render(); ``render`` is a coroutine function."""
+    if not is_shared(_alias()):
+        return mark_safe(await render())
+    key = FRAGMENT_KEY.format(user_id, await aget_version(user_id), _digest(params))
+    cache = _cache()
+    html = await cache.aget(key)
+    if html is not None:
+        _count('hits')
+        return mark_safe(html)
+    _count('misses')
+    html = await render()
+    await cache.aset(key, str(html), _timeout())
+    return mark_safe(html)
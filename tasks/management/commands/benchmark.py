@@ -0,0 +1,114 @@
+import datetime
+import json
+import platform
+import subprocess
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.scenarios import SCENARIOS, isolated_environment
+
+# Options forwarded to every scenario when given; each scenario uses the ones it knows
+SCENARIO_OPTIONS = ('users', 'tasks_per_user', 'audit_rows', 'requests', 'concurrency', 'server')
+
+
+class Command(BaseCommand):
+    help = (
+        "Run benchmark scenarios against a throwaway test database and report JSON results. "
+        "Set DB_TEST_NAME to a file to benchmark SQLite on disk instead of in memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help="Scenario names (default: all).")
+        parser.add_argument('--list', action='store_true', help="List available scenarios and exit.")
+        parser.add_argument('--size', type=int, default=500, help="Number of items a scenario works with.")
+        parser.add_argument('--output', help="Also write the JSON report to this file.")
+        parser.add_argument('--compare', help="Earlier JSON report to print the changes against.")
+        parser.add_argument('--users', type=int, help="load: number of seeded users.")
+        parser.add_argument('--tasks', dest='tasks_per_user', type=int, help="load: tasks per user (default: --size).")
+        parser.add_argument('--audit-rows', type=int, help="load: AuditLog rows (default: 10 x --size).")
+        parser.add_argument('--requests', type=int, help="load: requests per endpoint.")
+        parser.add_argument('--concurrency', type=int, help="Concurrent clients for the HTTP drivers.")
+        parser.add_argument(
+            '--server', choices=['client', 'wsgi', 'asgi', 'all'],
+            help="load: drive the test client, a local WSGI server, a local ASGI server (needs uvicorn) or all.",
+        )
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name, func in sorted(SCENARIOS.items()):
+                self.stdout.write(f"{name}: {(func.__doc__ or '').strip()}")
+            return
+
+        names = options['scenarios'] or sorted(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}. Use --list to see them.")
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as fh:
+                    baseline = json.load(fh)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {options['compare']}: {e}")
+
+        scenario_options = {name: options[name] for name in SCENARIO_OPTIONS if options[name] is not None}
+        report = {'meta': self.metadata(options['size'], scenario_options), 'scenarios': {}}
+        with isolated_environment():
+            for name in names:
+                self.stderr.write(f"Running {name}...")
+                report['scenarios'][name] = SCENARIOS[name](size=options['size'], **scenario_options)
+
+        output = json.dumps(report, indent=2, default=str)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                fh.write(output + '\n')
+        if baseline is not None:
+            self.compare(baseline, report)
+
+    def metadata(self, size, scenario_options):
+        """What a report was measured on, so runs can be compared across commits."""
+        try:
+            commit = subprocess.run(
+                ['git', 'describe', '--always', '--dirty'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=10,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return {
+            'commit': commit,
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'machine': platform.machine(),
+            'size': size,
+            **scenario_options,
+        }
+
+    def compare(self, baseline, report):
+        """Print every number present in both reports, with the relative change."""
+        before = dict(flatten(baseline.get('scenarios', baseline)))
+        after = flatten(report['scenarios'])
+        commit = baseline.get('meta', {}).get('commit') or 'an unknown commit'
+        self.stderr.write(f"Changes since {commit}:")
+        for key, value in after:
+            old = before.get(key)
+            if old is None:
+                continue
+            change = f"{(value - old) / old:+.1%}" if old else "n/a"
+            self.stderr.write(f"  {key}: {old} -> {value} ({change})")
+
+
+def flatten(data, prefix=''):
+    """Yield (dotted.key, number) for every numeric leaf."""
+    for key, value in data.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict):
+            yield from flatten(value, f'{path}.')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, value
@@ -0,0 +1,93 @@
+import statistics
+import time
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+
+from core.hashers import get_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Time Argon2 on this host and suggest ARGON2_* settings: the most memory (up to --max-memory) "
+        "and then the most passes that still hash within --target-ms. Raising the cost is what makes "
+        "stolen hashes expensive to crack, so pick the largest target logins can afford."
+    )
+
+    def add_arguments(self, parser):
+        config = get_config()
+        parser.add_argument('--target-ms', type=float, default=100, help="Time budget per hash in milliseconds.")
+        parser.add_argument(
+            '--max-memory', type=int, default=config['MEMORY_COST'],
+            help="Largest memory cost to try, in KiB (default: the current ARGON2 MEMORY_COST).",
+        )
+        parser.add_argument(
+            '--min-memory', type=int, default=19456,
+            help="Smallest memory cost to accept, in KiB (default: 19 MiB, the OWASP minimum).",
+        )
+        parser.add_argument(
+            '--parallelism', type=int, default=config['PARALLELISM'],
+            help="Lanes per hash (default: the current ARGON2 PARALLELISM).",
+        )
+        parser.add_argument('--max-time-cost', type=int, default=10, help="Most passes to try.")
+        parser.add_argument('--samples', type=int, default=5, help="Hashes timed per candidate; the median counts.")
+
+    def handle(self, *args, **options):
+        if options['target_ms'] <= 0 or options['samples'] < 1:
+            raise CommandError("--target-ms and --samples must be positive.")
+        if options['min_memory'] > options['max_memory']:
+            raise CommandError("--min-memory is larger than --max-memory.")
+        if options['min_memory'] < 8 * options['parallelism']:
+            raise CommandError("Argon2 needs at least 8 KiB of memory per lane.")
+        target, parallelism = options['target_ms'], options['parallelism']
+
+        current = get_config()
+        self.stdout.write(
+            f"Current: time_cost={current['TIME_COST']} memory_cost={current['MEMORY_COST']} "
+            f"parallelism={current['PARALLELISM']}: "
+            f"{self.time(current['TIME_COST'], current['MEMORY_COST'], current['PARALLELISM'], options):.1f} ms"
+        )
+
+        # Memory first: it is what makes GPU/ASIC attacks costly
+        memory = options['max_memory']
+        elapsed = self.time(1, memory, parallelism, options)
+        while elapsed > target and memory > options['min_memory']:
+            memory = max(options['min_memory'], memory // 2)
+            elapsed = self.time(1, memory, parallelism, options)
+        if elapsed > target:
+            self.stderr.write(self.style.WARNING(
+                f"Even time_cost=1 memory_cost={memory} takes {elapsed:.1f} ms; using the minimum anyway."
+            ))
+
+        # Then as many passes as still fit the budget
+        time_cost = 1
+        while time_cost < options['max_time_cost']:
+            candidate = self.time(time_cost + 1, memory, parallelism, options)
+            if candidate > target:
+                break
+            time_cost, elapsed = time_cost + 1, candidate
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Suggested: time_cost={time_cost} memory_cost={memory} parallelism={parallelism}: "
+            f"{elapsed:.1f} ms (target {target:g} ms)"
+        ))
+        self.stdout.write(
+            f"ARGON2_TIME_COST={time_cost}\nARGON2_MEMORY_COST={memory}\nARGON2_PARALLELISM={parallelism}"
+        )
+        self.stdout.write(
+            "Existing hashes keep verifying and are re-hashed with these values at each user's next login."
+        )
+
+    def time(self, time_cost, memory_cost, parallelism, options):
+        """Median milliseconds for one Django Argon2 hash with these parameters."""
+        hasher = Argon2PasswordHasher()
+        hasher.time_cost, hasher.memory_cost, hasher.parallelism = time_cost, memory_cost, parallelism
+        samples = []
+        for _ in range(options['samples']):
+            start = time.perf_counter()
+            hasher.encode('calibration-password', hasher.salt())
+            samples.append((time.perf_counter() - start) * 1000)
+        elapsed = statistics.median(samples)
+        if options['verbosity'] > 1:
+            self.stderr.write(f"  t={time_cost} m={memory_cost} p={parallelism}: {elapsed:.1f} ms")
+        return elapsed
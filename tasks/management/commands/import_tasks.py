@@ -0,0 +1,114 @@
+import csv
+import json
+import sys
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import bulk
+from tasks.export import csv_unguard
+from tasks.models import Task
+from tasks.validation import validate_row
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from a CSV or JSONL file (the format written by the task export). "
+        "Rows are validated with the TaskForm rules (tasks/validation.py) and inserted in "
+        "bulk_create batches, one transaction per batch; invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for standard input.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Input format (default: from the file extension).")
+        parser.add_argument('--owner', help="Username that owns every imported task (default: the file's 'owner' column).")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows inserted per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only; write nothing.")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or Path(options['path']).suffix.lstrip('.')
+        if fmt not in ('csv', 'jsonl'):
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        owner = None
+        if options['owner']:
+            try:
+                owner = User.objects.get(username=options['owner'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named '{options['owner']}'.")
+        self.owners = {}
+
+        if options['path'] == '-':
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(options['path'], newline='', encoding='utf-8')
+            except OSError as e:
+                raise CommandError(f"Cannot open {options['path']}: {e}")
+
+        verb = "Validated" if options['dry_run'] else "Imported"
+        imported = invalid = 0
+        batch = []
+        with stream:
+            for line_number, row in self.read(stream, fmt):
+                task, errors = self.build(row, owner)
+                if errors:
+                    invalid += 1
+                    self.stderr.write(f"Line {line_number}: {errors}")
+                    continue
+                batch.append(task)
+                if len(batch) >= options['batch_size']:
+                    imported += self.flush(batch, options)
+                    self.stdout.write(f"{verb} {imported} tasks...")
+                    batch = []
+            if batch:
+                imported += self.flush(batch, options)
+
+        self.stdout.write(self.style.SUCCESS(f"{verb} {imported} tasks; skipped {invalid} invalid rows."))
+
+    def read(self, stream, fmt):
+        """Yield (line number, row dict); malformed lines yield a non-dict row."""
+        if fmt == 'csv':
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, {key: csv_unguard(value) for key, value in row.items() if key is not None}
+        else:
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, None
+
+    def build(self, row, owner):
+        """Return (unsaved task, None) or (None, errors) for one input row."""
+        if not isinstance(row, dict):
+            return None, "not a valid JSON object"
+        # Same rules as the create form and the bulk API
+        cleaned, errors = validate_row(row)
+        if errors:
+            return None, json.dumps(errors)
+        owner = owner or self.lookup_owner(row.get('owner'))
+        if owner is None:
+            return None, f"unknown owner {row.get('owner')!r}"
+        task = Task(owner=owner, **cleaned)
+        completed = row.get('is_completed')
+        task.is_completed = completed if isinstance(completed, bool) else str(completed).strip().lower() in TRUE_VALUES
+        return task, None
+
+    def lookup_owner(self, username):
+        if not username or not isinstance(username, str):
+            return None
+        if username not in self.owners:
+            self.owners[username] = User.objects.filter(username=username).first()
+        return self.owners[username]
+
+    def flush(self, batch, options):
+        if not options['dry_run']:
+            # One transaction per batch; sends tasks_bulk_changed for search, stats and the change feed
+            bulk.insert(batch, batch_size=options['batch_size'])
+        return len(batch)
@@ -0,0 +1,87 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import AuditLog
+
+ARCHIVE_FIELDS = ('id', 'timestamp', 'action', 'user_id', 'user__username', 'ip_address', 'user_agent', 'details')
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive AuditLog rows older than the retention window into monthly "
+        "gzip-compressed JSONL files, then delete them in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'AUDIT_LOG_RETENTION_DAYS', 90),
+            help="Retention window in days (default: AUDIT_LOG_RETENTION_DAYS or 90).",
+        )
+        parser.add_argument(
+            '--archive-dir', default=getattr(settings, 'AUDIT_LOG_ARCHIVE_DIR', None),
+            help="Directory for auditlog-YYYY-MM.jsonl.gz files (default: AUDIT_LOG_ARCHIVE_DIR).",
+        )
+        parser.add_argument('--no-archive', action='store_true', help="Delete without archiving.")
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Rows read and archived per chunk.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows deleted per DELETE statement.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many rows would be pruned.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = AuditLog.objects.filter(timestamp__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} audit events older than {cutoff:%Y-%m-%d %H:%M} would be pruned.")
+            return
+
+        archive_dir = None
+        if not options['no_archive']:
+            archive_dir = Path(options['archive_dir'] or Path(settings.BASE_DIR) / 'audit_archive')
+            archive_dir.mkdir(parents=True, exist_ok=True)
+
+        archives = {}
+        total = 0
+        try:
+            while True:
+                # Rows are deleted as we go, so the oldest chunk is always next.
+                # Only one chunk is held in memory at a time.
+                chunk = list(
+                    expired.order_by('timestamp', 'id').values(*ARCHIVE_FIELDS)[:options['chunk_size']]
+                )
+                if not chunk:
+                    break
+                if archive_dir is not None:
+                    self.archive(chunk, archive_dir, archives)
+                ids = [row['id'] for row in chunk]
+                for start in range(0, len(ids), options['batch_size']):
+                    AuditLog.objects.filter(id__in=ids[start:start + options['batch_size']]).delete()
+                total += len(chunk)
+                self.stdout.write(f"Pruned {total} audit events...")
+        finally:
+            for archive in archives.values():
+                archive.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Pruned {total} audit events older than {cutoff:%Y-%m-%d %H:%M}."
+        ))
+
+    def archive(self, chunk, archive_dir, archives):
+        for row in chunk:
+            month = f"{row['timestamp']:%Y-%m}"
+            if month not in archives:
+                # Append mode adds a new gzip member, so re-runs never clobber old data
+                archives[month] = gzip.open(archive_dir / f'auditlog-{month}.jsonl.gz', 'at', encoding='utf-8')
+            row['username'] = row.pop('user__username')
+            row['timestamp'] = row['timestamp'].isoformat()
+            archives[month].write(json.dumps(row) + '\n')
+        # Make the archived rows durable before they are deleted
+        for archive in archives.values():
+            archive.flush()
+            os.fsync(archive.buffer.fileobj.fileno())
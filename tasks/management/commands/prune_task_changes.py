@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.changes import prune
+
+
+class Command(BaseCommand):
+    help = "Delete task change feed entries older than the retention window, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'TASK_CHANGE_RETENTION_DAYS', 7),
+            help="Retention window in days (default: TASK_CHANGE_RETENTION_DAYS or 7).",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows deleted per DELETE statement.")
+
+    def handle(self, *args, **options):
+        total = prune(options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Pruned {total} task changes older than {options['days']} days. "
+            "Clients holding older cursors get 410 and reload."
+        ))
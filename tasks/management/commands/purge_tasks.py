@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.trash import purge_accounts, purge_trash
+
+
+class Command(BaseCommand):
+    help = (
+        "Physically delete tasks that have been in the trash longer than the retention window, "
+        "and finish scheduled account removals. Deletes in small batches, each its own short "
+        "transaction. Run it from cron, or keep it running as a worker with --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'TASK_TRASH_RETENTION_DAYS', 30),
+            help="Trash retention in days (default: TASK_TRASH_RETENTION_DAYS or 30).",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tasks deleted per DELETE statement.")
+        parser.add_argument('--pause', type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Keep running, starting a new pass every INTERVAL seconds (default: one pass).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            tasks = purge_trash(
+                before=timezone.now() - timedelta(days=options['days']),
+                batch_size=options['batch_size'], pause=options['pause'],
+            )
+            accounts, account_tasks = purge_accounts(batch_size=options['batch_size'], pause=options['pause'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Purged {tasks} trashed tasks and {accounts} removed accounts ({account_tasks} tasks)."
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
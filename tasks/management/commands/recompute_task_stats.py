@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tasks.stats import recompute_all
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user task counters (TaskStats) from the Task table in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Users upserted per statement.")
+
+    def handle(self, *args, **options):
+        updated = recompute_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed task statistics for {updated} users."))
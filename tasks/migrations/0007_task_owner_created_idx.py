@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 06:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_adminactionlog_alter_auditlog_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='task_owner_created_idx'),
+        ),
+    ]
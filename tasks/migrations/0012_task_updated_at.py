@@ -0,0 +1,23 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_taskstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+            preserve_default=False,
+        ),
+        # Existing rows were last changed no later than they were created
+        migrations.RunSQL(
+            "UPDATE tasks_task SET updated_at = created_at",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
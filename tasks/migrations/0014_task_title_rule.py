@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-18 06:34
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_taskchange'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='title',
+            field=models.CharField(max_length=200, validators=[django.core.validators.RegexValidator(re.compile('^[a-zA-Z0-9\\s\\-\\.\\?]+\\Z'), 'Only alphanumeric characters, spaces, and basic punctuation are allowed.')]),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-18 07:23
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0017_task_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='title',
+            field=models.CharField(max_length=200, validators=[django.core.validators.RegexValidator(re.compile('^[a-zA-Z0-9\\s]+\\Z'), 'Invalid characters! Only letters and numbers allowed.')]),
+        ),
+    ]
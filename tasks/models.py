@@ -1,22 +1,124 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.admin.models import LogEntry
-from django.core.validators import RegexValidator
+from .validation import PRIORITY_CHOICES, PRIORITY_NORMAL, TITLE_MAX_LENGTH, validate_title_characters
+
+class TaskQuerySet(models.QuerySet):
+    def for_list(self):
+        # List pages never render the unbounded description; it is loaded
+        # only when a single task is opened (edit form, API detail, export)
+        return self.defer('description')
+
+    def trashed(self):
+        return self.filter(deleted_at__isnull=False)
+
+class TaskManager(models.Manager.from_queryset(TaskQuerySet)):
+    # Soft-deleted tasks (see tasks/trash.py) are only reachable through Task.all_objects
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 class Task(models.Model):
-    title = models.CharField(
-        max_length=200,
-        validators=[RegexValidator(r'^[a-zA-Z0-9\s\-\.\?]+$', "Only alphanumeric characters, spaces, and basic punctuation are allowed.")]
-    )
+    PRIORITY_CHOICES = PRIORITY_CHOICES
+
+    # The one title rule for every entry path (see tasks/validation.py)
+    title = models.CharField(max_length=TITLE_MAX_LENGTH, validators=[validate_title_characters])
     description = models.TextField()
     is_completed = models.BooleanField(default=False)
     # RBAC: Track which user owns the task to prevent IDOR 
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    due_at = models.DateTimeField(null=True, blank=True)
+    priority = models.PositiveSmallIntegerField(choices=PRIORITY_CHOICES, default=PRIORITY_NORMAL)
+    # Set when the task is moved to the trash; purge_tasks deletes the row later
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = TaskManager()
+    all_objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination of a user's task list (see tasks/pagination.py)
+            models.Index(fields=['owner', 'created_at', 'id'], name='task_owner_created_idx'),
+            # Back the admin's is_completed and created_at filters
+            models.Index(fields=['is_completed', 'created_at'], name='task_completed_created_idx'),
+            models.Index(fields=['created_at'], name='task_created_idx'),
+            # The agenda's overdue / today / this week buckets are each one
+            # range scan. Only open tasks with a due date are indexed;
+            # is_completed sits in the condition rather than the columns
+            # because Django compiles is_completed=False to NOT is_completed,
+            # which SQLite cannot use as an equality prefix.
+            models.Index(
+                fields=['owner', 'due_at'],
+                condition=models.Q(is_completed=False, due_at__isnull=False, deleted_at__isnull=True),
+                name='task_owner_open_due_idx',
+            ),
+            # Only trashed rows: a user's trash, and the purge's oldest-first scan
+            models.Index(
+                fields=['owner', 'deleted_at'], condition=models.Q(deleted_at__isnull=False),
+                name='task_owner_trash_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'], condition=models.Q(deleted_at__isnull=False),
+                name='task_trash_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+class TaskStats(models.Model):
+    """Denormalized per-user task counters, kept current by signals (see tasks/stats.py)."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='task_stats')
+    total = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    last_modified = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Task Statistics"
+        verbose_name_plural = "Task Statistics"
+
+    @property
+    def open(self):
+        return self.total - self.completed
+
+    def __str__(self):
+        return f"{self.user_id}: {self.open} open / {self.completed} completed"
+
+class TaskChange(models.Model):
+    """One entry of a user's task change feed (see tasks/changes.py); the id is the sequence."""
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    # Not a foreign key: rows are written while a user's tasks are being
+    # cascade-deleted, and are pruned by age anyway
+    owner_id = models.IntegerField()
+    task_id = models.IntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            # "Changes for this user after cursor N" is one index range scan
+            models.Index(fields=['owner_id', 'id'], name='taskchange_owner_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} task {self.task_id} {self.action}"
+
+class AccountRemoval(models.Model):
+    """A deactivated account whose tasks and user row purge_tasks deletes in batches (see tasks/trash.py)."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    requested_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Removal of user {self.user_id} requested at {self.requested_at}"
+
 class AuditLog(models.Model):
     ACTION_CHOICES = [
         ('login', 'Login'),
@@ -29,12 +131,19 @@ class AuditLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(null=True, blank=True)
     details = models.TextField(null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when the buffered sink writes it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         verbose_name = "Security Event"
         verbose_name_plural = "Logging & Monitoring (Security)"
         ordering = ['-timestamp']
+        indexes = [
+            # Back the admin ordering/filters and the retention sweep
+            models.Index(fields=['timestamp'], name='auditlog_timestamp_idx'),
+            models.Index(fields=['action', 'timestamp'], name='auditlog_action_ts_idx'),
+            models.Index(fields=['ip_address', 'timestamp'], name='auditlog_ip_ts_idx'),
+        ]
 
     def __str__(self):
         user_info = f"{self.user.username}" if self.user else "Anonymous"
@@ -0,0 +1,136 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# Keyset (cursor) pagination over (created_at, id).
+# Unlike OFFSET paging, each page is a bounded index range scan on
+# (owner, created_at, id), so latency does not grow with the page number.
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None
+    prev_cursor: str | None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+
+def encode_cursor(created_at, pk, direction):
+    """Build an opaque, URL-safe token for a (created_at, id) position."""
+    payload = json.dumps([created_at.isoformat(), pk, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, pk, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor("Malformed cursor.")
+    created_at = parse_datetime(created_at) if isinstance(created_at, str) else None
+    if created_at is None or not isinstance(pk, int) or direction not in ('next', 'prev'):
+        raise InvalidCursor("Malformed cursor.")
+    return created_at, pk, direction
+
+
+def get_page_size(value=None):
+    default = getattr(settings, 'TASK_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    try:
+        size = int(value) if value else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _key(row):
+    if isinstance(row, dict):
+        return row['created_at'], row['id']
+    return row.created_at, row.pk
+
+
+def _page_query(queryset, cursor, page_size):
+    page_size = get_page_size(page_size)
+    direction = 'next'
+
+    if cursor:
+        created_at, pk, direction = decode_cursor(cursor)
+        if direction == 'next':
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        else:
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            )
+
+    if direction == 'next':
+        queryset = queryset.order_by('-created_at', '-id')
+    else:
+        queryset = queryset.order_by('created_at', 'id')
+
+    # Fetch one extra row to learn whether another page exists
+    return queryset[:page_size + 1], page_size, direction
+
+
+def _build_page(rows, cursor, page_size, direction):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == 'prev':
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if direction == 'next':
+            if has_more:
+                next_cursor = encode_cursor(*_key(rows[-1]), 'next')
+            if cursor:
+                prev_cursor = encode_cursor(*_key(rows[0]), 'prev')
+        else:
+            if has_more:
+                prev_cursor = encode_cursor(*_key(rows[0]), 'prev')
+            next_cursor = encode_cursor(*_key(rows[-1]), 'next')
+
+    return KeysetPage(rows, next_cursor, prev_cursor)
+
+
+def paginate(queryset, cursor=None, page_size=None):
+    """
+    Return one KeysetPage of ``queryset`` ordered newest first.
+
+    ``queryset`` may be a model or ``values()`` queryset; in the latter case
+    ``created_at`` and ``id`` must be among the selected fields.
+    Raises InvalidCursor for tokens that cannot be decoded.
+    """
+    queryset, page_size, direction = _page_query(queryset, cursor, page_size)
+    return _build_page(list(queryset), cursor, page_size, direction)
+
+
+async def apaginate(queryset, cursor=None, page_size=None):
+    """Async paginate(), for views running on the event loop."""
+    queryset, page_size, direction = _page_query(queryset, cursor, page_size)
+    return _build_page([row async for row in queryset], cursor, page_size, direction)
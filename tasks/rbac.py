@@ -0,0 +1,119 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+from core.caches import is_shared
+
+from .models import Task
+
+# Task access rules (RBAC), shared by the HTML views, the async views, the JSON
+# API and the bulk operations. Ownership is decided on owner_id, so it never
+# loads a User. A user with the global change / delete permission may act on
+# every task; everyone else only on their own.
+#
+# Permission sets are loaded once per request (ModelBackend keeps them on the
+# user object) and, through CachedModelBackend, shared across requests in the
+# cache when every worker shares it (see core/caches.py); a per-process cache
+# would keep a revoked permission alive in the other workers. Signals
+# (tasks/signals.py) drop a user's entry when their groups, permissions or
+# superuser flag change, and bump a global generation when a group's
+# permissions change, which orphans every entry at once.
+
+CHANGE_PERM = 'tasks.change_task'
+DELETE_PERM = 'tasks.delete_task'
+
+CACHE_KEY = 'rbac_perms:{}'
+GENERATION_KEY = 'rbac_generation'
+
+
+def _timeout():
+    return getattr(settings, 'RBAC_CACHE_TIMEOUT', 300)
+
+
+def _new_generation():
+    # Never restart at a small number after eviction, which could make
+    # entries cached under an earlier generation valid again
+    return time.time_ns() // 1000
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose per-user permission sets are shared across requests through the cache."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not is_shared():
+            return super().get_all_permissions(user_obj)
+        if not hasattr(user_obj, '_perm_cache'):
+            key = CACHE_KEY.format(user_obj.pk)
+            # One round trip for both the generation and the entry
+            found = cache.get_many([GENERATION_KEY, key])
+            generation = found.get(GENERATION_KEY)
+            if generation is None:
+                cache.add(GENERATION_KEY, _new_generation(), None)
+                generation = cache.get(GENERATION_KEY)
+            entry = found.get(key)
+            if entry is not None and entry[0] == generation:
+                user_obj._perm_cache = entry[1]
+            else:
+                user_obj._perm_cache = super().get_all_permissions(user_obj)
+                cache.set(key, (generation, user_obj._perm_cache), _timeout())
+        return user_obj._perm_cache
+
+
+def invalidate_user(user_id):
+    key = CACHE_KEY.format(user_id)
+    # Drop the cached set once the change is visible to other requests
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_all():
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY, _new_generation(), None))
+
+
+async def ahas_perm(user, perm):
+    # Django 5.1 has no async has_perm(); a cold permission lookup queries
+    return await sync_to_async(user.has_perm)(perm)
+
+
+def _scope(user, global_perm, tasks=None):
+    tasks = Task.objects.all() if tasks is None else tasks
+    if global_perm:
+        return tasks
+    return tasks.filter(owner_id=user.pk)
+
+
+def editable_tasks(user):
+    """Tasks ``user`` may read and change."""
+    return _scope(user, user.has_perm(CHANGE_PERM))
+
+
+async def aeditable_tasks(user):
+    return _scope(user, await ahas_perm(user, CHANGE_PERM))
+
+
+def deletable_tasks(user):
+    """Tasks ``user`` may delete."""
+    return _scope(user, user.has_perm(DELETE_PERM))
+
+
+async def adeletable_tasks(user):
+    return _scope(user, await ahas_perm(user, DELETE_PERM))
+
+
+def restorable_tasks(user):
+    """Trashed tasks ``user`` may restore: the same rule as deleting them."""
+    return _scope(user, user.has_perm(DELETE_PERM), Task.all_objects.trashed())
+
+
+def can_delete(user, task):
+    # Owners need no permission lookup at all
+    return task.owner_id == user.pk or user.has_perm(DELETE_PERM)
+
+
+async def acan_delete(user, task):
+    return task.owner_id == user.pk or await ahas_perm(user, DELETE_PERM)
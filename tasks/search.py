@@ -0,0 +1,185 @@
+import re
+from abc import ABC, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+# Pluggable full-text search for tasks.
+# - SQLite: an FTS5 virtual table (tasks_task_fts) kept in sync by signals
+# - PostgreSQL: a GIN index over a tsvector expression (no sync needed)
+# - Fallback: the original icontains scan
+# Searches return the SEARCH_LIMIT best matches, ranked by relevance (bm25 /
+# ts_rank; newest first for the fallback), rather than pages of the list.
+
+FTS_TABLE = 'tasks_task_fts'
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce(\"tasks_task\".\"title\", '') || ' ' || "
+    "coalesce(\"tasks_task\".\"description\", ''))"
+)
+PG_INDEX = 'tasks_task_search_gin'
+
+MAX_TERMS = 8
+SEARCH_LIMIT = 50
+TERM_RE = re.compile(r'\w+')
+
+
+def parse_terms(query):
+    """Split user input into plain word terms; operators and quotes are dropped."""
+    return TERM_RE.findall(query)[:MAX_TERMS]
+
+
+class BaseSearchBackend(ABC):
+    # How ranked() orders matches, best first
+    ordering = ('-created_at', '-id')
+
+    @abstractmethod
+    def filter(self, queryset, query):
+        """Restrict ``queryset`` to tasks matching ``query`` (ordering untouched)."""
+
+    def rank(self, query):
+        """Expression scoring a match, higher is better; None if the backend has no ranking."""
+        return None
+
+    def ranked(self, queryset, query):
+        """filter() ordered best match first; the score is annotated as ``search_rank``."""
+        queryset = self.filter(queryset, query)
+        rank = self.rank(query)
+        if rank is not None:
+            queryset = queryset.annotate(search_rank=rank)
+        return queryset.order_by(*self.ordering)
+
+    def search(self, queryset, query, limit=SEARCH_LIMIT):
+        """Return up to ``limit`` tasks from ``queryset`` ordered by relevance."""
+        return list(self.ranked(queryset, query)[:limit])
+
+    def index(self, task):
+        self.index_many([task])
+
+    def remove(self, task_id):
+        self.remove_many([task_id])
+
+    def index_many(self, tasks):
+        pass
+
+    def remove_many(self, task_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    def filter(self, queryset, query):
+        # Parameterized
+        return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    # Title matches weigh more than description matches; bm25 is lower for
+    # better matches, so the score is its negation
+    RANK = f"-bm25({FTS_TABLE}, 10.0, 1.0)"
+    ordering = ('-search_rank', '-id')
+
+    def match_expression(self, query):
+        # Every term is quoted (no FTS syntax injection) and prefix-matched
+        terms = parse_terms(query)
+        return ' '.join(f'"{term}"*' for term in terms) if terms else None
+
+    def filter(self, queryset, query):
+        expression = self.match_expression(query)
+        if expression is None:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+        ))
+
+    def rank(self, query):
+        expression = self.match_expression(query)
+        if expression is None:
+            return Value(0.0)  # filter() matched nothing
+        return RawSQL(
+            f"SELECT {self.RANK} FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = tasks_task.id",
+            [expression], output_field=FloatField(),
+        )
+
+    def index_many(self, tasks):
+        with connections[router.db_for_write(Task)].cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[task.pk] for task in tasks])
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)",
+                [[task.pk, task.title, task.description] for task in tasks],
+            )
+
+    def remove_many(self, task_ids):
+        with connections[router.db_for_write(Task)].cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[task_id] for task_id in task_ids])
+
+    def rebuild(self):
+        with connections[router.db_for_write(Task)].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+                f"SELECT id, title, description FROM tasks_task WHERE deleted_at IS NULL"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    ordering = ('-search_rank', '-id')
+
+    def tsquery(self, query):
+        terms = parse_terms(query)
+        return ' & '.join(f'{term}:*' for term in terms) if terms else None
+
+    def filter(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if tsquery is None:
+            return queryset.none()
+        return queryset.filter(RawSQL(
+            f"{PG_DOCUMENT} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField()
+        ))
+
+    def rank(self, query):
+        tsquery = self.tsquery(query)
+        if tsquery is None:
+            return Value(0.0)  # filter() matched nothing
+        return RawSQL(f"ts_rank({PG_DOCUMENT}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+
+    def rebuild(self):
+        with connections[router.db_for_write(Task)].cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {PG_INDEX}")
+
+
+_backends = {}
+
+
+def get_search_backend():
+    """Return the search backend for the database that task reads use."""
+    alias = router.db_for_read(Task)
+    if alias not in _backends:
+        path = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+        connection = connections[alias]
+        if path:
+            backend = import_string(path)()
+        elif connection.vendor == 'postgresql':
+            backend = PostgresSearchBackend()
+        elif connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+            backend = SQLiteFTSSearchBackend()
+        else:
+            backend = IContainsSearchBackend()
+        _backends[alias] = backend
+    return _backends[alias]
+
+
+async def aget_search_backend():
+    """Async get_search_backend(); only the first call per alias leaves the event loop."""
+    alias = router.db_for_read(Task)
+    if alias in _backends:
+        return _backends[alias]
+    return await sync_to_async(get_search_backend)()
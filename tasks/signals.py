@@ -1,10 +1,20 @@
 import logging
-from django.dispatch import receiver
+from django.dispatch import receiver, Signal
+from django.contrib.auth.models import Group, Permission, User
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
-from .models import AuditLog
+from django.db.models.signals import m2m_changed, post_init, post_save, post_delete
+from .models import Task
+from .audit import record_event
+from .search import get_search_backend
+from . import changes, rbac, stats, fragment_cache, throttle
 
 logger = logging.getLogger(__name__)
 
+# Sent by set-based writes (tasks/bulk.py) that bypass per-row model signals.
+# Keyword arguments: created (list of Task), updated / deleted (lists of
+# (pk, owner_id) pairs); each is omitted when empty.
+tasks_bulk_changed = Signal()
+
 def get_client_ip(request):
     if not request:
         return None
@@ -15,21 +25,27 @@ def get_client_ip(request):
         ip = request.META.get('REMOTE_ADDR')
     return ip
 
+# Security events go through the buffered audit sink (tasks/audit.py) so that
+# a burst of logins never blocks requests on AuditLog INSERTs.
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
-    AuditLog.objects.create(
+    record_event(
+        'login',
         user=user,
-        action='login',
         ip_address=get_client_ip(request),
         user_agent=request.META.get('HTTP_USER_AGENT', ''),
         details=f"User {user.username} logged in successfully."
     )
+    throttle.reset_username(user.get_username())
 
 @receiver(user_logged_out)
 def log_user_logout(sender, request, user, **kwargs):
-    AuditLog.objects.create(
+    # Logging out an anonymous session sends user=None
+    if user is None:
+        return
+    record_event(
+        'logout',
         user=user,
-        action='logout',
         ip_address=get_client_ip(request),
         user_agent=request.META.get('HTTP_USER_AGENT', ''),
         details=f"User {user.username} logged out."
@@ -38,10 +54,162 @@ def log_user_logout(sender, request, user, **kwargs):
 @receiver(user_login_failed)
 def log_user_login_failed(sender, credentials, request=None, **kwargs):
     username = credentials.get('username', 'UNKNOWN')
-    AuditLog.objects.create(
-        action='failed',
-        ip_address=get_client_ip(request),
+    ip = get_client_ip(request)
+    # Attempts refused by the throttle are audited but not counted again,
+    # so the window can drain while an attacker keeps hammering
+    if not getattr(request, '_login_throttled', False):
+        throttle.record_failure(ip, credentials.get('username'))
+    record_event(
+        'failed',
+        ip_address=ip,
         user_agent=request.META.get('HTTP_USER_AGENT', '') if request else '',
         details=f"Failed login attempt for username: {username}"
     )
-    logger.warning(f"Security Audit: Failed login attempt for username: {username}")
+    logger.warning(
+        "Security Audit: Failed login attempt for username: %s", username,
+        extra={'event': 'login_failed', 'username': username, 'ip': ip},
+    )
+
+# Keep the full-text search index in step with task writes
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+# A trashed task already left the index, stats, cached tables and feed when it
+# was trashed (tasks/trash.py); the post_delete receivers below skip it
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    if instance.deleted_at is None:
+        get_search_backend().remove(instance.pk)
+
+@receiver(tasks_bulk_changed)
+def index_bulk_changes(sender, created=(), deleted=(), **kwargs):
+    backend = get_search_backend()
+    if created:
+        backend.index_many(created)
+    if deleted:
+        backend.remove_many([pk for pk, _ in deleted])
+
+# Remember the loaded owner and completion state so post_save receivers can
+# tell what changed. __dict__ is read directly so deferred fields are never
+# fetched. The state is refreshed by the last receiver in this module.
+@receiver(post_init, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    instance._loaded_state = (instance.__dict__.get('owner_id'), instance.__dict__.get('is_completed'))
+
+# Per-user task counters (tasks/stats.py): apply only the delta that changed
+
+@receiver(post_save, sender=Task)
+def update_task_stats(sender, instance, created, **kwargs):
+    old_owner_id, was_completed = instance._loaded_state
+    completed = int(bool(instance.is_completed))
+    if created:
+        stats.apply_delta(instance.owner_id, total=1, completed=completed)
+    elif old_owner_id is None or was_completed is None:
+        # Loaded with deferred fields: the previous state is unknown
+        stats.recompute_for_user(instance.owner_id)
+    elif old_owner_id != instance.owner_id:
+        stats.apply_delta(old_owner_id, total=-1, completed=-int(bool(was_completed)))
+        stats.apply_delta(instance.owner_id, total=1, completed=completed)
+    else:
+        stats.apply_delta(instance.owner_id, completed=completed - int(bool(was_completed)))
+
+@receiver(post_delete, sender=Task)
+def discount_task_stats(sender, instance, **kwargs):
+    if instance.deleted_at is not None:
+        return
+    stats.apply_delta(instance.owner_id, total=-1, completed=-int(bool(instance.is_completed)))
+
+@receiver(tasks_bulk_changed)
+def recompute_bulk_task_stats(sender, created=(), updated=(), deleted=(), **kwargs):
+    # New rows are a known delta; updates and deletes only carry ids
+    owner_ids = {owner_id for _, owner_id in (*updated, *deleted)}
+    deltas = {}
+    for task in created:
+        if task.owner_id not in owner_ids:
+            total, completed = deltas.get(task.owner_id, (0, 0))
+            deltas[task.owner_id] = (total + 1, completed + int(bool(task.is_completed)))
+    for owner_id, (total, completed) in deltas.items():
+        stats.apply_delta(owner_id, total=total, completed=completed)
+    for owner_id in owner_ids:
+        stats.recompute_for_user(owner_id)
+
+# Orphan the user's cached task table whenever one of their tasks changes
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_table(sender, instance, **kwargs):
+    if instance.deleted_at is not None:
+        return
+    fragment_cache.bump_version(instance.owner_id)
+    old_owner_id = instance._loaded_state[0]
+    if old_owner_id is not None and old_owner_id != instance.owner_id:
+        fragment_cache.bump_version(old_owner_id)
+
+@receiver(tasks_bulk_changed)
+def invalidate_bulk_task_tables(sender, created=(), updated=(), deleted=(), **kwargs):
+    owner_ids = {task.owner_id for task in created}
+    owner_ids.update(owner_id for _, owner_id in (*updated, *deleted))
+    for owner_id in owner_ids:
+        fragment_cache.bump_version(owner_id)
+
+# Append to the owners' change feeds (tasks/changes.py), inside the write's transaction
+@receiver(post_save, sender=Task)
+def record_task_change(sender, instance, created, **kwargs):
+    old_owner_id = instance._loaded_state[0]
+    if created:
+        changes.record(instance.owner_id, instance.pk, 'created')
+    elif old_owner_id is not None and old_owner_id != instance.owner_id:
+        # Reassigned: it leaves one feed and joins another
+        changes.record_many([(old_owner_id, instance.pk, 'deleted'), (instance.owner_id, instance.pk, 'created')])
+    else:
+        changes.record(instance.owner_id, instance.pk, 'updated')
+
+@receiver(post_delete, sender=Task)
+def record_task_deletion(sender, instance, **kwargs):
+    if instance.deleted_at is None:
+        changes.record(instance.owner_id, instance.pk, 'deleted')
+
+@receiver(tasks_bulk_changed)
+def record_bulk_task_changes(sender, created=(), updated=(), deleted=(), **kwargs):
+    changes.record_many([
+        *((task.owner_id, task.pk, 'created') for task in created),
+        *((owner_id, pk, 'updated') for pk, owner_id in updated),
+        *((owner_id, pk, 'deleted') for pk, owner_id in deleted),
+    ])
+
+# Cached permission sets (tasks/rbac.py): drop what a grant or revoke changed
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        rbac.invalidate_user(instance.pk)
+    elif pk_set:
+        # Changed from the permission's or group's side: pk_set holds users
+        for user_id in pk_set:
+            rbac.invalidate_user(user_id)
+    else:
+        rbac.invalidate_all()  # clear() from that side: the users are unknown
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action.startswith('post_'):
+        rbac.invalidate_all()
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_deleted_permissions(sender, **kwargs):
+    rbac.invalidate_all()
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user_permissions(sender, instance, created, update_fields, **kwargs):
+    # is_superuser may have changed; a login only touches last_login
+    if not created and update_fields != frozenset({'last_login'}):
+        rbac.invalidate_user(instance.pk)
+
+# Keep last: the saved values become the baseline for the next save
+@receiver(post_save, sender=Task)
+def refresh_task_state(sender, instance, **kwargs):
+    instance._loaded_state = (instance.owner_id, instance.is_completed)
@@ -0,0 +1,138 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from core.caches import is_shared
+
+from .models import Task, TaskStats
+
+# Per-user task counters.
+# Signals apply +/- deltas to TaskStats with a single UPDATE, and readers get
+# the counters from the cache, so summary widgets never COUNT a user's rows.
+# The cached copy is dropped on write, which only reaches every worker in a
+# shared cache (see core/caches.py); otherwise readers get the TaskStats row
+# (one indexed lookup), which also keeps the list ETag (tasks/api.py) exact.
+
+CACHE_KEY = 'task_stats:{}'
+
+
+def _cache_timeout():
+    return getattr(settings, 'TASK_STATS_CACHE_TIMEOUT', 300)
+
+
+def _as_dict(stats):
+    return {
+        'total': stats.total,
+        'completed': stats.completed,
+        'open': stats.open,
+        'last_modified': stats.last_modified,
+    }
+
+
+def get_task_stats(user_id):
+    """Return {'total', 'completed', 'open', 'last_modified'} for a user."""
+    key = CACHE_KEY.format(user_id)
+    shared = is_shared()
+    data = cache.get(key) if shared else None
+    if data is None:
+        try:
+            stats = TaskStats.objects.get(user_id=user_id)
+        except TaskStats.DoesNotExist:
+            stats = recompute_for_user(user_id)
+        data = _as_dict(stats)
+        if shared:
+            cache.set(key, data, _cache_timeout())
+    return data
+
+
+async def aget_task_stats(user_id):
+    """Async get_task_stats()."""
+    key = CACHE_KEY.format(user_id)
+    shared = is_shared()
+    data = await cache.aget(key) if shared else None
+    if data is None:
+        try:
+            stats = await TaskStats.objects.aget(user_id=user_id)
+        except TaskStats.DoesNotExist:
+            stats = await sync_to_async(recompute_for_user)(user_id)
+        data = _as_dict(stats)
+        if shared:
+            await cache.aset(key, data, _cache_timeout())
+    return data
+
+
+def invalidate(user_id):
+    key = CACHE_KEY.format(user_id)
+    # Drop the cached copy once the write is visible to other requests
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def apply_delta(user_id, total=0, completed=0):
+    TaskStats.objects.filter(user_id=user_id).update(
+        total=F('total') + total,
+        completed=F('completed') + completed,
+        last_modified=timezone.now(),
+    )
+    # A missing row is rebuilt lazily by get_task_stats; creating it here could
+    # race with the user's own deletion cascade.
+    invalidate(user_id)
+
+
+def recompute_for_user(user_id):
+    counts = Task.objects.filter(owner_id=user_id).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_completed=True)),
+    )
+    stats, _ = TaskStats.objects.update_or_create(
+        user_id=user_id,
+        defaults={**counts, 'last_modified': timezone.now()},
+    )
+    invalidate(user_id)
+    return stats
+
+
+def recompute_all(batch_size=1000):
+    """Rebuild every user's counters with one grouped scan of Task."""
+    now = timezone.now()
+    rows = (
+        Task.objects.order_by()
+        .values('owner_id')
+        .annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+    )
+    batch = []
+    updated = 0
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(TaskStats(
+            user_id=row['owner_id'], total=row['total'], completed=row['completed'], last_modified=now,
+        ))
+        if len(batch) >= batch_size:
+            updated += _upsert(batch)
+            batch = []
+    if batch:
+        updated += _upsert(batch)
+    # Users whose tasks are all gone keep a row, reset to zero
+    TaskStats.objects.exclude(user_id__in=Task.objects.values('owner_id')).update(
+        total=0, completed=0, last_modified=now,
+    )
+    keys = []
+    for user_id in TaskStats.objects.values_list('user_id', flat=True).iterator(chunk_size=batch_size):
+        keys.append(CACHE_KEY.format(user_id))
+        if len(keys) >= batch_size:
+            cache.delete_many(keys)
+            keys = []
+    cache.delete_many(keys)
+    return updated
+
+
+def _upsert(batch):
+    # One INSERT ... ON CONFLICT DO UPDATE per batch
+    TaskStats.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['total', 'completed', 'last_modified'],
+    )
+    return len(batch)
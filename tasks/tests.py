@@ -0,0 +1,755 @@
+import base64
+import csv
+import datetime
+import gzip
+import io
+import json
+import logging
+import os
+import tempfile
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.hashers import TunedArgon2PasswordHasher
+from core.logs import RotatingJSONFileHandler
+
+from . import changes, throttle
+from .admin import EstimatedCountPaginator
+from .agenda import AGENDA_LIMIT, agenda_sections, bounds, section_queryset
+from .async_views import wait_for_changes
+from .forms import TaskForm
+from .models import AccountRemoval, Task, TaskChange, TaskStats
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+from .rbac import CACHE_KEY
+from .search import FTS_TABLE, BaseSearchBackend, get_search_backend
+from .stats import get_task_stats
+from .trash import move_to_trash, purge_account, purge_accounts, purge_trash, schedule_account_removal
+from .validation import validate_row
+
+
+def make_user(username, **fields):
+    user = User(username=username, **fields)
+    user.set_unusable_password()
+    user.save()
+    return user
+
+
+def seed_tasks(owner, count):
+    return Task.objects.bulk_create(
+        [Task(title=f'Task {i}', description='Description.', owner=owner) for i in range(count)]
+    )
+
+
+# One process serves every request; the audit log is written inline
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    CACHE_SINGLE_PROCESS=True,
+    AUDIT_LOG={'SYNC': True},
+)
+class QueryCountTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+
+class AdminChangelistTests(QueryCountTestCase):
+    url = reverse('admin:tasks_task_changelist')
+
+    def setUp(self):
+        super().setUp()
+        self.admin = make_user('admin', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        self.owner = make_user('owner')
+
+    def test_query_count_does_not_grow_with_rows(self):
+        seed_tasks(self.owner, 5)
+        self.client.get(self.url)  # warm caches (content types)
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        seed_tasks(self.owner, 200)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].result_count, 205)
+
+    def test_count_is_capped(self):
+        seed_tasks(self.owner, 5)
+        paginator = EstimatedCountPaginator(Task.objects.order_by('pk'), 2)
+        paginator.EXACT_COUNT_LIMIT = 3
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.count, 4)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LIMIT 4', queries[0]['sql'])
+
+
+class AgendaTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        self.client.force_login(self.owner)
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', owner=self.owner, is_completed=i % 3 == 0,
+                 due_at=now + datetime.timedelta(hours=i - 50) if i % 4 else None)
+            for i in range(100)
+        ])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite-specific')
+    def test_sections_search_the_open_due_index(self):
+        for key, (start, end) in bounds().items():
+            with self.subTest(section=key):
+                plan = section_queryset(self.owner.pk, start, end).explain()
+                self.assertIn('SEARCH', plan)
+                self.assertIn('task_owner_open_due_idx', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_sections_match_bucketing_in_python(self):
+        now = timezone.now()
+        tasks = [task for task in Task.objects.filter(owner=self.owner) if not task.is_completed and task.due_at]
+        expected = {
+            key: sorted(
+                (task for task in tasks if (start is None or task.due_at >= start) and task.due_at < end),
+                key=lambda task: (task.due_at, task.pk),
+            )[:AGENDA_LIMIT]
+            for key, (start, end) in bounds(now).items()
+        }
+        sections = {section['key']: section['tasks'] for section in agenda_sections(self.owner.pk, now)}
+        self.assertEqual(sections, expected)
+
+    def test_one_query_per_section(self):
+        url = reverse('task_agenda')
+        self.client.get(url)
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+
+class TaskViewQueryTests(QueryCountTestCase):
+    """
+    Queries per task view once the permission cache is warm, for the owner
+    and for a manager whose change / delete permissions come from a group.
+    Both cost the same: neither reads the permission tables or loads a
+    task's owner.
+    """
+
+    expected = {
+        'task_list': 2,  # session, user; the table comes from the fragment cache
+        'edit_get': 3,
+        'edit_post': 8,
+        'delete_post': 14,
+        'restore_post': 11,
+        'bulk_complete': 12,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        self.manager = make_user('manager')
+        group = Group.objects.create(name='managers')
+        group.permissions.set(Permission.objects.filter(
+            content_type__app_label='tasks', codename__in=['change_task', 'delete_task'],
+        ))
+        self.manager.groups.add(group)
+        self.tasks = iter(seed_tasks(self.owner, 20))
+
+    def requests(self):
+        edit, delete, bulk = next(self.tasks), next(self.tasks), next(self.tasks)
+        trashed = next(self.tasks)
+        move_to_trash(Task.objects.filter(pk=trashed.pk))
+        form = {'title': 'Edited', 'description': 'Edited.', 'priority': '2'}
+        return {
+            'task_list': lambda: self.client.get(reverse('task_list')),
+            'edit_get': lambda: self.client.get(reverse('edit_task', args=[edit.pk])),
+            'edit_post': lambda: self.client.post(reverse('edit_task', args=[edit.pk]), form),
+            'delete_post': lambda: self.client.post(reverse('delete_task', args=[delete.pk])),
+            'restore_post': lambda: self.client.post(reverse('restore_task', args=[trashed.pk])),
+            'bulk_complete': lambda: self.client.post(
+                reverse('bulk_tasks'), json.dumps({'action': 'complete', 'ids': [bulk.pk]}),
+                content_type='application/json',
+            ),
+        }
+
+    def assert_query_counts(self, user):
+        self.client.force_login(user)
+        for call in self.requests().values():
+            call()  # warm the permission and fragment caches
+        for view, call in self.requests().items():
+            with self.subTest(view=view):
+                with self.assertNumQueries(self.expected[view]):
+                    response = call()
+                self.assertIn(response.status_code, (200, 302))
+
+    def test_owner(self):
+        self.assert_query_counts(self.owner)
+
+    def test_manager(self):
+        self.assert_query_counts(self.manager)
+
+    def test_warm_requests_skip_permission_and_owner_lookups(self):
+        for user in (self.owner, self.manager):
+            self.client.force_login(user)
+            for call in self.requests().values():
+                call()
+            for view, call in self.requests().items():
+                with self.subTest(user=user.username, view=view):
+                    with CaptureQueriesContext(connection) as queries:
+                        call()
+                    sql = [query['sql'] for query in queries]
+                    self.assertFalse([s for s in sql if '"auth_permission"' in s or '"auth_group"' in s])
+                    # Only the session's own user: ownership is compared on owner_id
+                    self.assertLessEqual(sum(s.startswith('SELECT') and 'FROM "auth_user"' in s for s in sql), 1)
+
+    def test_revoked_permission_applies_to_the_next_request(self):
+        task = next(self.tasks)
+        self.client.force_login(self.manager)
+        self.assertEqual(self.client.get(reverse('edit_task', args=[task.pk])).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            Group.objects.get(name='managers').permissions.clear()
+        self.assertEqual(self.client.get(reverse('edit_task', args=[task.pk])).status_code, 404)
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_per_process_cache_is_not_shared_across_requests(self):
+        self.client.force_login(self.manager)
+        self.client.get(reverse('edit_task', args=[next(self.tasks).pk]))
+        self.assertIsNone(cache.get(CACHE_KEY.format(self.manager.pk)))
+
+
+class TrashTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        self.tasks = seed_tasks(self.owner, 5)
+        get_search_backend().rebuild()  # bulk_create bypasses the indexing signals
+
+    def trash(self, tasks):
+        with self.captureOnCommitCallbacks(execute=True):
+            move_to_trash(Task.objects.filter(pk__in=[task.pk for task in tasks]))
+
+    def test_purge_leaves_counters_and_feed_alone(self):
+        self.trash(self.tasks[:2])
+        feed = TaskChange.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = purge_trash(before=timezone.now() + datetime.timedelta(seconds=1))
+        self.assertEqual(deleted, 2)
+        self.assertEqual(Task.all_objects.count(), 3)
+        self.assertEqual(get_task_stats(self.owner.pk)['total'], 3)
+        self.assertEqual(TaskChange.objects.count(), feed)
+
+    def test_restore_after_delete(self):
+        task = self.tasks[0]
+        self.client.force_login(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('delete_task', args=[task.pk]))
+        self.assertFalse(Task.objects.filter(pk=task.pk).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('restore_task', args=[task.pk]))
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
+        self.assertEqual(get_task_stats(self.owner.pk)['total'], 5)
+
+    def test_purge_accounts_deletes_live_and_trashed_tasks(self):
+        self.trash(self.tasks[:1])
+        schedule_account_removal(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(purge_accounts(batch_size=2), (1, 5))
+        self.assertFalse(Task.all_objects.exists())
+        self.assertFalse(User.objects.filter(pk=self.owner.pk).exists())
+        self.assertFalse(AccountRemoval.objects.exists())
+        self.assertFalse(TaskStats.objects.filter(user_id=self.owner.pk).exists())
+        self.assertFalse(TaskChange.objects.filter(owner_id=self.owner.pk).exists())
+
+    def test_purge_account_skips_per_batch_bookkeeping(self):
+        schedule_account_removal(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            purge_account(self.owner.pk, batch_size=1)
+        # Stats and feed rows are dropped with the account, never updated per batch
+        writes = [
+            sql for sql in (query['sql'] for query in queries)
+            if sql.startswith(('INSERT', 'UPDATE')) and ('"tasks_taskchange"' in sql or '"tasks_taskstats"' in sql)
+        ]
+        self.assertEqual(writes, [])
+
+    @skipUnless(connection.vendor == 'sqlite', 'The FTS5 index is SQLite-only')
+    def test_purge_account_leaves_the_search_index(self):
+        schedule_account_removal(self.owner)
+        purge_account(self.owner.pk, batch_size=2)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    @skipUnless(connection.vendor == 'sqlite', 'The FTS5 index is SQLite-only')
+    def test_search_rebuild_skips_trashed_tasks(self):
+        self.trash(self.tasks[:2])
+        get_search_backend().rebuild()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid FROM {FTS_TABLE}')
+            self.assertEqual({row[0] for row in cursor.fetchall()}, {task.pk for task in self.tasks[2:]})
+
+    def test_user_delete_confirmation_does_not_collect_tasks(self):
+        admin = make_user('admin', is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+        pages = {
+            'delete_view': lambda: self.client.get(reverse('admin:auth_user_delete', args=[self.owner.pk])),
+            'delete_selected': lambda: self.client.post(
+                reverse('admin:auth_user_changelist'),
+                {'action': 'delete_selected', '_selected_action': [self.owner.pk]},
+            ),
+        }
+        for name, page in pages.items():
+            with self.subTest(page=name):
+                with CaptureQueriesContext(connection) as queries:
+                    response = page()
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'tasks purged later in batches')
+                self.assertFalse([query for query in queries if 'tasks_task' in query['sql']])
+
+
+class PaginationTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        # Every task shares one created_at: only the id breaks the tie
+        created_at = timezone.now()
+        self.tasks = seed_tasks(self.owner, 7)
+        Task.objects.update(created_at=created_at)
+        self.ids = sorted((task.pk for task in self.tasks), reverse=True)
+
+    def pages(self, page_size=3):
+        queryset = Task.objects.filter(owner=self.owner)
+        pages = [paginate(queryset, page_size=page_size)]
+        while pages[-1].has_next:
+            pages.append(paginate(queryset, cursor=pages[-1].next_cursor, page_size=page_size))
+        return pages
+
+    def test_pages_are_stable_on_equal_created_at(self):
+        pages = self.pages()
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([task.pk for page in pages for task in page], self.ids)
+        self.assertFalse(pages[0].has_previous)
+
+    def test_previous_cursor_returns_the_page_before(self):
+        pages = self.pages()
+        queryset = Task.objects.filter(owner=self.owner)
+        for before, page in zip(pages, pages[1:]):
+            previous = paginate(queryset, cursor=page.prev_cursor, page_size=3)
+            self.assertEqual([task.pk for task in previous], [task.pk for task in before])
+            self.assertEqual(previous.next_cursor, before.next_cursor)
+
+    def test_cursor_round_trip(self):
+        created_at = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42, 'prev')), (created_at, 42, 'prev'))
+
+    def test_malformed_cursors_are_rejected(self):
+        def token(payload):
+            return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+        for cursor in (
+            'garbage!', '%%%', token('not json'), token('[]'), token('{"a": 1}'),
+            token('["yesterday", 1, "next"]'), token('["2024-01-01T00:00:00", "1", "next"]'),
+            token('["2024-01-01T00:00:00", 1, "sideways"]'),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        self.client.force_login(self.owner)
+        for url in (reverse('task_list'), reverse('api_task_list')):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, {'cursor': 'garbage!'}).status_code, 400)
+
+
+class SearchTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        # Created oldest first: newest-first ordering would put them backwards
+        self.title_match = Task.objects.create(owner=self.owner, title='Invoice March', description='Send it')
+        self.description_match = Task.objects.create(
+            owner=self.owner, title='Accounting', description='Check the invoice totals',
+        )
+        Task.objects.create(owner=self.owner, title='Unrelated', description='Nothing here')
+
+    def test_base_backend_is_abstract(self):
+        with self.assertRaises(TypeError):
+            BaseSearchBackend()
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Needs a ranking search backend')
+    def test_title_matches_rank_first(self):
+        expected = [self.title_match.pk, self.description_match.pk]
+        tasks = Task.objects.filter(owner=self.owner)
+        self.assertEqual([task.pk for task in get_search_backend().search(tasks, 'invoice')], expected)
+
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('task_list'), {'q': 'invoice'})
+        self.assertEqual([task.pk for task in response.context['page']], expected)
+        self.assertFalse(response.context['page'].has_next)
+
+        response = self.client.get(reverse('api_task_list'), {'q': 'invoice', 'fields': 'id'})
+        self.assertEqual([row['id'] for row in response.json()['results']], expected)
+
+        admin = make_user('admin', is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:tasks_task_changelist'), {'q': 'invoice'})
+        self.assertEqual([task.pk for task in response.context['cl'].result_list], expected)
+
+
+class BulkTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        self.other = make_user('other')
+        self.mine = Task.objects.create(owner=self.owner, title='Mine')
+        self.theirs = Task.objects.create(owner=self.other, title='Theirs')
+        self.client.force_login(self.owner)
+
+    def post(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('bulk_tasks'), json.dumps(payload), content_type='application/json')
+
+    def test_other_users_ids_are_ignored(self):
+        for action in ('complete', 'reopen', 'delete'):
+            with self.subTest(action=action):
+                response = self.post({'action': action, 'ids': [self.theirs.pk]})
+                self.assertEqual(response.json()['count'], 0)
+        self.theirs.refresh_from_db()
+        self.assertFalse(self.theirs.is_completed)
+        self.assertIsNone(self.theirs.deleted_at)
+
+    def test_complete_updates_stats_and_feed(self):
+        get_task_stats(self.owner.pk)  # cached before the write
+        response = self.post({'action': 'complete', 'ids': [self.mine.pk, self.theirs.pk]})
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(get_task_stats(self.owner.pk)['completed'], 1)
+        self.assertEqual(get_task_stats(self.other.pk)['completed'], 0)
+        self.assertTrue(TaskChange.objects.filter(owner_id=self.owner.pk, task_id=self.mine.pk, action='updated').exists())
+        self.assertFalse(TaskChange.objects.filter(task_id=self.theirs.pk, action='updated').exists())
+
+    def test_delete_updates_stats_and_feed(self):
+        response = self.post({'action': 'delete', 'ids': [self.mine.pk]})
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(get_task_stats(self.owner.pk)['total'], 0)
+        self.assertTrue(TaskChange.objects.filter(task_id=self.mine.pk, action='deleted').exists())
+
+    def test_create_updates_stats_and_feed(self):
+        response = self.post({'action': 'create', 'tasks': [
+            {'title': 'One', 'description': 'First'}, {'title': 'Two', 'description': 'Second', 'priority': 3},
+        ]})
+        self.assertEqual(response.status_code, 201)
+        ids = response.json()['ids']
+        self.assertEqual(set(Task.objects.filter(pk__in=ids).values_list('owner_id', flat=True)), {self.owner.pk})
+        self.assertEqual(get_task_stats(self.owner.pk)['total'], 3)
+        self.assertEqual(TaskChange.objects.filter(task_id__in=ids, action='created').count(), 2)
+
+    def test_invalid_requests_are_rejected(self):
+        payloads = {
+            'string id': {'action': 'complete', 'ids': [str(self.mine.pk)]},
+            'float id': {'action': 'delete', 'ids': [1.5]},
+            'bool id': {'action': 'complete', 'ids': [True]},
+            'no ids': {'action': 'complete', 'ids': []},
+            'unknown action': {'action': 'archive', 'ids': [self.mine.pk]},
+            'bad priority': {'action': 'create', 'tasks': [
+                {'title': 'Fine', 'description': 'Valid'}, {'title': 'Bad', 'description': 'Valid', 'priority': 9},
+            ]},
+        }
+        for name, payload in payloads.items():
+            with self.subTest(payload=name):
+                response = self.post(payload)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()['errors']['1']), ['priority'])
+        # All or nothing: the valid row of the rejected create was not written
+        self.assertFalse(Task.objects.filter(title='Fine').exists())
+        self.mine.refresh_from_db()
+        self.assertFalse(self.mine.is_completed)
+
+
+class ApiTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        self.other = make_user('other')
+        self.task = Task.objects.create(owner=self.owner, title='Mine', description='Mine')
+        self.theirs = Task.objects.create(owner=self.other, title='Theirs', description='Theirs')
+        self.client.force_login(self.owner)
+
+    def detail(self, task):
+        return reverse('api_task_detail', args=[task.pk])
+
+    def patch(self, task, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(self.detail(task), json.dumps(data), content_type='application/json')
+
+    def test_other_users_tasks_are_not_found(self):
+        self.assertEqual(self.client.get(self.detail(self.theirs)).status_code, 404)
+        self.assertEqual(self.patch(self.theirs, {'title': 'Taken'}).status_code, 404)
+        self.assertEqual(self.client.delete(self.detail(self.theirs)).status_code, 404)
+        self.theirs.refresh_from_db()
+        self.assertEqual(self.theirs.title, 'Theirs')
+        self.assertIsNone(self.theirs.deleted_at)
+        ids = [row['id'] for row in self.client.get(reverse('api_task_list')).json()['results']]
+        self.assertEqual(ids, [self.task.pk])
+
+    def test_anonymous_requests_are_unauthorized(self):
+        self.client.logout()
+        for url in (reverse('api_task_list'), self.detail(self.task)):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 401)
+                self.assertIn('error', response.json())
+
+    def test_etags_answer_not_modified_until_a_write(self):
+        for number, url in enumerate((reverse('api_task_list'), self.detail(self.task))):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, headers={'if-none-match': etag}).status_code, 304)
+                self.assertEqual(self.patch(self.task, {'title': f'Edited {number}'}).status_code, 200)
+                response = self.client.get(url, headers={'if-none-match': etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_invalid_parameters_are_bad_requests(self):
+        cases = {
+            'unknown field': lambda: self.client.get(reverse('api_task_list'), {'fields': 'title,password'}),
+            'unknown detail field': lambda: self.client.get(self.detail(self.task), {'fields': 'owner'}),
+            'bad cursor': lambda: self.client.get(reverse('api_task_list'), {'cursor': 'not-a-cursor'}),
+            'string is_completed': lambda: self.patch(self.task, {'is_completed': 'yes'}),
+            'integer is_completed': lambda: self.patch(self.task, {'is_completed': 1}),
+            'body not an object': lambda: self.patch(self.task, ['title']),
+        }
+        for name, call in cases.items():
+            with self.subTest(case=name):
+                response = call()
+                self.assertEqual(response.status_code, 400)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_completed)
+
+
+@override_settings(LOGIN_THROTTLE={'STORE': 'local', 'WINDOW': 300, 'IP_LIMIT': 3, 'USERNAME_LIMIT': 2})
+class LoginThrottleTests(QueryCountTestCase):
+    password = 'Correct-horse-1!'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password=cls.password)
+
+    def setUp(self):
+        super().setUp()
+        # The store is built once per process from the settings
+        throttle._store = None
+        self.addCleanup(setattr, throttle, '_store', None)
+
+    def login(self, username='owner', password='wrong', ip='10.0.0.1'):
+        self.client.logout()
+        self.client.post(reverse('login'), {'username': username, 'password': password}, REMOTE_ADDR=ip)
+        return '_auth_user_id' in self.client.session
+
+    def test_username_is_locked_after_failures(self):
+        self.login(ip='10.0.0.1')
+        self.login(ip='10.0.0.2')
+        # Even the right password from a fresh address is refused
+        self.assertFalse(self.login(password=self.password, ip='10.0.0.3'))
+        self.assertTrue(throttle.is_throttled(None, 'OWNER '))
+
+    def test_ip_is_locked_after_failures(self):
+        for username in ('a', 'b', 'c'):
+            self.login(username=username, ip='10.0.0.9')
+        self.assertFalse(self.login(password=self.password, ip='10.0.0.9'))
+        self.assertTrue(self.login(password=self.password, ip='10.0.0.10'))
+
+    def test_locked_attempts_never_reach_the_hasher(self):
+        self.login()
+        self.login()
+        with mock.patch.object(TunedArgon2PasswordHasher, 'verify') as verify:
+            self.assertFalse(self.login(password=self.password))
+        verify.assert_not_called()
+
+    def test_success_resets_the_username(self):
+        self.login()
+        self.assertTrue(self.login(password=self.password))
+        self.assertEqual(throttle.get_store().count('user:owner'), 0)
+        self.login()
+        self.assertTrue(self.login(password=self.password))
+
+    def test_refused_attempts_do_not_extend_the_lockout(self):
+        self.login()
+        self.login()
+        for _ in range(5):
+            self.login(password=self.password)
+        self.assertEqual(throttle.get_store().count('user:owner'), 2)
+        self.assertEqual(throttle.get_store().count('ip:10.0.0.1'), 2)
+
+    @override_settings(LOGIN_THROTTLE={'STORE': 'cache'}, CACHE_SINGLE_PROCESS=False)
+    def test_per_process_cache_falls_back_to_the_local_store(self):
+        with self.assertLogs('tasks.throttle', 'WARNING'):
+            self.assertIsInstance(throttle.get_store(), throttle.LocalRateLimitStore)
+
+
+@override_settings(SERVER_TIMING=True)
+class ServerTimingTests(QueryCountTestCase):
+    """SQL is counted per request, sync or async, without wrapping connections per request."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        seed_tasks(self.owner, 3)
+
+    def queries(self, response):
+        return int(response['Server-Timing'].split('desc="')[1].split(' ')[0])
+
+    def test_sync_request(self):
+        self.client.force_login(self.owner)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('task_list'))
+        self.assertEqual(self.queries(response), len(captured))
+
+    async def test_async_request(self):
+        await self.async_client.aforce_login(self.owner)
+        response = await self.async_client.get(reverse('task_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.queries(response), 0)
+
+
+class ValidationTests(TestCase):
+    """validate_row (bulk API, import) accepts and rejects exactly what TaskForm does."""
+
+    rows = [
+        {'title': 'Plain title 2', 'description': 'Fine.'},
+        {'title': '  Padded  ', 'description': '  Padded.  '},
+        {'title': 'Tab\tinside', 'description': 'Fine.'},
+        {'title': 'Dash-title', 'description': 'Fine.'},
+        {'title': 'Dot.', 'description': 'Fine.'},
+        {'title': 'Question?', 'description': 'Fine.'},
+        {'title': '=1+1', 'description': 'Fine.'},
+        {'title': 'Caf\u00e9', 'description': 'Fine.'},
+        {'title': 'Null\x00', 'description': 'Fine.'},
+        {'title': 'x' * 201, 'description': 'Fine.'},
+        {'title': '', 'description': ''},
+        {'title': '   ', 'description': 'Fine.'},
+        {'title': 'Valid', 'description': 'Fine.', 'priority': '3', 'due_at': '2030-01-02T03:04'},
+        {'title': 'Valid', 'description': 'Fine.', 'priority': '9'},
+        {'title': 'Valid', 'description': 'Fine.', 'due_at': 'tomorrow'},
+    ]
+
+    def test_matches_task_form(self):
+        for row in self.rows:
+            with self.subTest(row=row):
+                form = TaskForm(data=row)
+                cleaned, errors = validate_row(row)
+                self.assertEqual(errors, None if form.is_valid() else form.errors.get_json_data())
+                if cleaned is not None:
+                    self.assertEqual(cleaned, {field: form.cleaned_data[field] for field in cleaned})
+
+
+class ExportTests(QueryCountTestCase):
+    descriptions = ['=1+1', '+1', '-1', '@SUM(A1)', "'=quoted", "'plain", 'Plain text.']
+    fields = ('title', 'description', 'priority', 'is_completed', 'due_at')
+
+    def setUp(self):
+        super().setUp()
+        self.owner = make_user('owner')
+        due = timezone.now().replace(microsecond=0) + datetime.timedelta(days=1)
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}', description=description, owner=self.owner,
+                priority=i % 3 + 1, is_completed=i % 2 == 0, due_at=due if i % 2 else None,
+            )
+            for i, description in enumerate(self.descriptions)
+        ])
+        self.client.force_login(self.owner)
+
+    def export(self):
+        response = self.client.get(reverse('export_tasks', args=['csv']))
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_formula_cells_are_quoted(self):
+        rows = list(csv.DictReader(io.StringIO(self.export())))
+        self.assertEqual(
+            [row['description'] for row in rows],
+            ["'=1+1", "'+1", "'-1", "'@SUM(A1)", "''=quoted", "''plain", 'Plain text.'],
+        )
+
+    def test_import_restores_the_export(self):
+        other = make_user('other')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8') as file:
+            file.write(self.export())
+            file.flush()
+            call_command('import_tasks', file.name, owner='other', stdout=io.StringIO())
+        exported = list(Task.objects.filter(owner=self.owner).order_by('id').values(*self.fields))
+        imported = list(Task.objects.filter(owner=other).order_by('id').values(*self.fields))
+        self.assertEqual(imported, exported)
+
+
+class ChangeFeedConnectionTests(TransactionTestCase):
+    """A long-poll closes its connection after every check instead of holding it while it waits."""
+
+    async def test_connection_released_between_polls(self):
+        config = dict(changes.get_config(), POLL_INTERVAL=0.01)
+        # The feed queries from a worker thread, on that thread's connection
+        wrapper = type(connections['default'])
+        with (
+            mock.patch.object(changes, 'fetch', wraps=changes.fetch) as fetch,
+            mock.patch.object(wrapper, 'close', autospec=True, side_effect=wrapper.close) as close,
+        ):
+            batch = await wait_for_changes(1, 0, 0.05, config)
+        self.assertEqual(batch, [])
+        self.assertGreater(fetch.call_count, 1)
+        self.assertEqual(close.call_count, fetch.call_count)
+
+
+class LogRotationTests(SimpleTestCase):
+    """Several workers' handlers on one security.log (see core/logs.py)."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'security.log')
+
+    def handler(self, **options):
+        handler = RotatingJSONFileHandler(self.filename, **options)
+        self.addCleanup(handler.close)
+        return handler
+
+    def log(self, handler, message):
+        handler.handle(logging.LogRecord('tests', logging.WARNING, __file__, 0, message, (), None))
+
+    def read(self, filename):
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filename, 'rt') as file:
+            return [json.loads(line)['message'] for line in file]
+
+    def test_workers_rotate_once_and_lose_nothing(self):
+        workers = [self.handler(max_bytes=2000, backup_count=100) for _ in range(2)]
+        messages = [f'record {i}' for i in range(200)]
+        for i, message in enumerate(messages):
+            self.log(workers[i % 2], message)
+        backups = sorted(name for name in os.listdir(os.path.dirname(self.filename)) if '.log.' in name)
+        self.assertIn('security.log.1', backups)
+        self.assertIn('security.log.2.gz', backups)
+        logged = []
+        for name in backups:
+            if name != 'security.log.rotation':
+                logged += self.read(os.path.join(os.path.dirname(self.filename), name))
+        current = self.read(self.filename)
+        # Both workers follow each other's rollovers to the new file
+        self.assertEqual(current[-2:], messages[-2:])
+        self.assertCountEqual(logged + current, messages)
+
+    def test_window_starts_when_the_file_does(self):
+        handler = self.handler(interval=60)
+        now = 1_000_000.0
+        with mock.patch('time.time', return_value=now):
+            self.log(handler, 'first')
+        with mock.patch('time.time', return_value=now + 59):
+            self.log(handler, 'second')  # the write moves the mtime, not the window
+        self.assertFalse(os.path.exists(self.filename + '.1'))
+        with mock.patch('time.time', return_value=now + 60):
+            self.log(handler, 'third')
+        self.assertEqual(self.read(self.filename + '.1'), ['first', 'second'])
+        self.assertEqual(self.read(self.filename), ['third'])
+        with open(self.filename + '.rotation') as state:
+            self.assertEqual(float(state.read()), now + 60)
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+
+from core.caches import is_shared
+
+# Login brute-force throttling.
+# Failed logins are counted per client IP and per username over a sliding
+# window. LoginThrottleBackend sits first in AUTHENTICATION_BACKENDS and
+# refuses over-limit attempts before ModelBackend runs the password hasher.
+# Note: the IP comes from get_client_ip, which trusts X-Forwarded-For, so the
+# per-username limit is the one an attacker cannot sidestep.
+# The 'cache' store only spans workers when the cache does (see core/caches.py);
+# on a per-process cache it falls back to the exact 'local' store, with a
+# warning, since each worker would count its own attempts either way.
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'STORE': 'cache',  # 'cache' (shared when the cache backend is) or 'local' (this process)
+    'CACHE': 'default',
+    'WINDOW': 300,
+    'IP_LIMIT': 20,
+    'USERNAME_LIMIT': 5,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'LOGIN_THROTTLE', {}))
+    return config
+
+
+class CacheRateLimitStore:
+    """
+    Sliding-window counter in the Django cache.
+
+    Keeps one counter per fixed window and weights the previous window by how
+    much of it still overlaps the sliding window: two keys per identity, no
+    per-attempt timestamps.
+    """
+
+    def __init__(self, window, alias='default'):
+        self.window = window
+        self.cache = caches[alias]
+
+    def _keys(self, key, now):
+        bucket = int(now // self.window)
+        return f'throttle:{key}:{bucket}', f'throttle:{key}:{bucket - 1}'
+
+    def hit(self, key):
+        current, _ = self._keys(key, time.time())
+        # add() is atomic on shared backends, so concurrent first hits are not lost
+        if not self.cache.add(current, 1, self.window * 2):
+            try:
+                self.cache.incr(current)
+            except ValueError:
+                self.cache.set(current, 1, self.window * 2)
+
+    def count(self, key):
+        now = time.time()
+        current, previous = self._keys(key, now)
+        values = self.cache.get_many([current, previous])
+        overlap = 1 - (now % self.window) / self.window
+        return values.get(current, 0) + values.get(previous, 0) * overlap
+
+    def reset(self, key):
+        self.cache.delete_many(self._keys(key, time.time()))
+
+
+class LocalRateLimitStore:
+    """Exact sliding log kept in this process's memory."""
+
+    def __init__(self, window, max_keys=100_000):
+        self.window = window
+        self.max_keys = max_keys
+        self._hits = {}
+        self._lock = threading.Lock()
+
+    def _trim(self, hits, now):
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+
+    def hit(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                if len(self._hits) >= self.max_keys:
+                    self._evict(now)
+                hits = self._hits[key] = deque()
+            self._trim(hits, now)
+            hits.append(now)
+
+    def count(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if not hits:
+                return 0
+            self._trim(hits, now)
+            return len(hits)
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _evict(self, now):
+        # Drop expired identities; if still full, drop the oldest half
+        for key in [key for key, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
+        if len(self._hits) >= self.max_keys:
+            for key in list(self._hits)[:self.max_keys // 2]:
+                del self._hits[key]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = get_config()
+                if config['STORE'] == 'cache' and not is_shared(config['CACHE']):
+                    logger.warning(
+                        "Login throttle cache %r is per-process; counting failed logins in each worker.",
+                        config['CACHE'],
+                    )
+                    config['STORE'] = 'local'
+                if config['STORE'] == 'local':
+                    _store = LocalRateLimitStore(config['WINDOW'])
+                else:
+                    _store = CacheRateLimitStore(config['WINDOW'], config['CACHE'])
+    return _store
+
+
+def _identities(ip_address, username):
+    config = get_config()
+    identities = []
+    if ip_address:
+        identities.append((f'ip:{ip_address}', config['IP_LIMIT']))
+    if username:
+        identities.append((f'user:{username.strip().lower()}', config['USERNAME_LIMIT']))
+    return identities
+
+
+def is_throttled(ip_address, username):
+    store = get_store()
+    return any(store.count(key) >= limit for key, limit in _identities(ip_address, username))
+
+
+def record_failure(ip_address, username):
+    store = get_store()
+    for key, _ in _identities(ip_address, username):
+        store.hit(key)
+
+
+def reset_username(username):
+    if username:
+        get_store().reset(f'user:{username.strip().lower()}')
+
+
+class LoginThrottleBackend:
+    """
+    Refuses authentication for throttled IPs/usernames without hashing anything.
+
+    Deliberately has no get_user(): it never authenticates anyone, so it must
+    not be picked as the session backend (e.g. by Client.force_login).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        from .signals import get_client_ip
+
+        if is_throttled(get_client_ip(request), username):
+            if request is not None:
+                request._login_throttled = True
+            # Stops the backend loop: ModelBackend (and its hasher) never runs
+            raise PermissionDenied
+        return None
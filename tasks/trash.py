@@ -0,0 +1,125 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import router, transaction
+from django.utils import timezone
+
+from . import fragment_cache
+from .models import AccountRemoval, Task, TaskChange
+from .search import get_search_backend
+from .signals import tasks_bulk_changed
+
+# Soft delete.
+# Deleting a task only stamps deleted_at (one UPDATE). The task disappears from
+# Task.objects and everything built on it, and stays restorable from the trash
+# for TASK_TRASH_RETENTION_DAYS. Removing an account deactivates it at once.
+# Rows are physically deleted later by `manage.py purge_tasks`, in batches
+# that each run as their own short transaction, so no request holds a
+# transaction open across a large cascade. Only trashed rows are ever
+# deleted: the search index, stats, cached tables and feed already dropped
+# them, so Task's post_delete receivers ignore them (tasks/signals.py). An
+# account purge stamps live rows first and drops the account's stats, feed
+# and cached tables once, at the end.
+
+# What Task.delete() reads of each purged row: its signals need no more
+PURGE_FIELDS = ('pk', 'owner_id', 'is_completed', 'deleted_at')
+
+def retention():
+    return datetime.timedelta(days=getattr(settings, 'TASK_TRASH_RETENTION_DAYS', 30))
+
+
+def move_to_trash(tasks):
+    """Soft-delete the live tasks in the queryset ``tasks``; returns the count."""
+    with transaction.atomic(using=router.db_for_write(Task)):
+        rows = list(tasks.values_list('pk', 'owner_id'))
+        if rows:
+            Task.objects.filter(pk__in=[pk for pk, _ in rows]).update(deleted_at=timezone.now())
+            # To search, stats, cached tables and the feed the task is gone
+            tasks_bulk_changed.send(sender=Task, deleted=rows)
+    return len(rows)
+
+
+def restore(tasks):
+    """Bring back the trashed tasks in the queryset ``tasks``; returns the count."""
+    with transaction.atomic(using=router.db_for_write(Task)):
+        pks = list(tasks.trashed().values_list('pk', flat=True))
+        if pks:
+            Task.all_objects.filter(pk__in=pks).update(deleted_at=None)
+            tasks_bulk_changed.send(sender=Task, created=list(Task.objects.filter(pk__in=pks)))
+    return len(pks)
+
+
+def schedule_account_removal(user):
+    """Deactivate ``user`` now; purge_accounts() deletes their tasks and the account later."""
+    with transaction.atomic(using=router.db_for_write(User)):
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        AccountRemoval.objects.get_or_create(user_id=user.pk)
+    user.is_active = False
+
+
+def purge_trash(before=None, batch_size=1000, pause=0.0):
+    """
+    Delete tasks trashed before ``before`` (default: the retention period ago)
+    in batches of ``batch_size``, sleeping ``pause`` seconds in between.
+    Returns the number deleted.
+    """
+    before = before or timezone.now() - retention()
+    total = 0
+    while True:
+        # Walks task_trash_idx from the oldest deletion
+        pks = list(
+            Task.all_objects.filter(deleted_at__lt=before).order_by('deleted_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return total
+        # Re-check at delete time: a task restored since it was read is kept
+        deleted, _ = Task.all_objects.filter(pk__in=pks, deleted_at__lt=before).only(*PURGE_FIELDS).delete()
+        total += deleted
+        if pause:
+            time.sleep(pause)
+
+
+def purge_account(user_id, batch_size=1000, pause=0.0):
+    """
+    Delete a user's tasks in batches, then the user; returns the number of tasks deleted.
+    Nothing of the account survives, so its counters, feed and cached tables
+    are dropped once at the end instead of being updated for every batch.
+    """
+    using = router.db_for_write(Task)
+    backend = get_search_backend()
+    total = 0
+    while True:
+        with transaction.atomic(using=using):
+            rows = list(
+                Task.all_objects.filter(owner_id=user_id).order_by('pk').values_list('pk', 'deleted_at')[:batch_size]
+            )
+            if not rows:
+                break
+            pks = [pk for pk, _ in rows]
+            live = [pk for pk, deleted_at in rows if deleted_at is None]
+            if live:
+                backend.remove_many(live)
+                # Stamped as trashed, the rows skip Task's post_delete receivers
+                Task.objects.filter(pk__in=live).update(deleted_at=timezone.now())
+            deleted, _ = Task.all_objects.filter(pk__in=pks).only(*PURGE_FIELDS).delete()
+        total += deleted
+        if pause:
+            time.sleep(pause)
+    with transaction.atomic(using=using):
+        TaskChange.objects.filter(owner_id=user_id).delete()
+        # Without tasks the cascade is a handful of rows, TaskStats among them
+        User.objects.filter(pk=user_id).delete()
+        fragment_cache.bump_version(user_id)
+    return total
+
+
+def purge_accounts(batch_size=1000, pause=0.0):
+    """Finish every scheduled account removal; returns (accounts, tasks) deleted."""
+    accounts = tasks = 0
+    for user_id in AccountRemoval.objects.order_by('requested_at').values_list('user_id', flat=True):
+        tasks += purge_account(user_id, batch_size=batch_size, pause=pause)
+        accounts += 1
+    return accounts, tasks
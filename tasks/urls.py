@@ -1,11 +1,28 @@
 # tasks/urls.py
+from django.conf import settings
 from django.urls import path
-from . import views
-
-urlpatterns = [
-    # This maps to the functions you wrote in tasks/views.py
-    path('', views.task_list, name='task_list'),
-    path('create/', views.create_task, name='create_task'),
-    path('edit/<int:pk>/', views.edit_task, name='edit_task'),
-    path('delete/<int:pk>/', views.delete_task, name='delete_task'),
-]
\ No newline at end of file
+from . import views, api, async_views
+
+
+def task_patterns(crud_views):
+    return [
+        # This maps to the functions you wrote in tasks/views.py
+        path('', crud_views.task_list, name='task_list'),
+        path('create/', crud_views.create_task, name='create_task'),
+        path('edit/<int:pk>/', crud_views.edit_task, name='edit_task'),
+        path('delete/<int:pk>/', crud_views.delete_task, name='delete_task'),
+        path('bulk/', views.bulk_tasks, name='bulk_tasks'),
+        path('agenda/', views.agenda, name='task_agenda'),
+        path('trash/', views.task_trash, name='task_trash'),
+        path('trash/<int:pk>/restore/', views.restore_task, name='restore_task'),
+        path('export/tasks.<str:fmt>', views.export_tasks, name='export_tasks'),
+        path('export/auditlog.<str:fmt>', views.export_auditlog, name='export_auditlog'),
+        # JSON API
+        path('api/tasks/', api.task_list, name='api_task_list'),
+        path('api/tasks/<int:pk>/', api.task_detail, name='api_task_detail'),
+        path('api/changes/', async_views.task_changes, name='api_task_changes'),
+    ]
+
+
+# Under ASGI the CRUD pages are served by the native async views (tasks/async_views.py)
+urlpatterns = task_patterns(async_views if settings.TASK_ASYNC_VIEWS else views)
@@ -0,0 +1,109 @@
+import re
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxLengthValidator, ProhibitNullCharactersValidator, RegexValidator
+
+# Canonical input rules for Task, shared by the model, TaskForm and the
+# bulk / import paths, so each value is checked by one precompiled rule, once.
+# validate_rows() applies the same rules and error format as TaskForm to a
+# whole batch without building a form per row.
+
+TITLE_MAX_LENGTH = 200
+# \Z, not $: "$" would also accept a trailing newline
+TITLE_PATTERN = re.compile(r'^[a-zA-Z0-9\s]+\Z')
+TITLE_MESSAGE = "Invalid characters! Only letters and numbers allowed."
+
+validate_title_characters = RegexValidator(TITLE_PATTERN, TITLE_MESSAGE)
+
+PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH = 1, 2, 3
+PRIORITY_CHOICES = [
+    (PRIORITY_LOW, 'Low'),
+    (PRIORITY_NORMAL, 'Normal'),
+    (PRIORITY_HIGH, 'High'),
+]
+
+REQUIRED_MESSAGE = "This field is required."
+
+# Field name -> validator stages, run on the stripped, non-empty value. As in
+# a ModelForm, the form field's checks come first and the model field's
+# character rule only runs when they pass.
+RULES = {
+    'title': (
+        (MaxLengthValidator(TITLE_MAX_LENGTH), ProhibitNullCharactersValidator()),
+        (validate_title_characters,),
+    ),
+    'description': (
+        (ProhibitNullCharactersValidator(),),
+    ),
+}
+
+# Optional fields: the same field objects TaskForm declares. A missing value
+# leaves the model default; an empty priority means Normal.
+OPTIONAL_FIELDS = {
+    'due_at': forms.DateTimeField(
+        required=False,
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+    ),
+    'priority': forms.TypedChoiceField(
+        choices=PRIORITY_CHOICES, coerce=int, required=False, empty_value=PRIORITY_NORMAL,
+    ),
+}
+
+EMPTY_VALUES = (None, '', [], (), {})
+
+
+def clean_value(value):
+    """Coerce and strip a raw value the way forms.CharField does."""
+    if value not in EMPTY_VALUES:
+        value = str(value).strip()
+    return '' if value in EMPTY_VALUES else value
+
+
+def _errors(error):
+    return [{'message': str(message), 'code': item.code or ''} for item in error.error_list for message in item]
+
+
+def validate_row(row):
+    """Return (cleaned {field: value}, None) or (None, {field: [{'message', 'code'}]})."""
+    if not isinstance(row, dict):
+        row = {}
+    cleaned, errors = {}, {}
+    for field, stages in RULES.items():
+        value = clean_value(row.get(field))
+        if not value:
+            errors[field] = [{'message': REQUIRED_MESSAGE, 'code': 'required'}]
+            continue
+        field_errors = []
+        for stage in stages:
+            for rule in stage:
+                try:
+                    rule(value)
+                except ValidationError as e:
+                    field_errors.extend(_errors(e))
+            if field_errors:
+                break
+        if field_errors:
+            errors[field] = field_errors
+        else:
+            cleaned[field] = value
+    for field, form_field in OPTIONAL_FIELDS.items():
+        if field not in row:
+            continue
+        try:
+            cleaned[field] = form_field.clean(row[field])
+        except ValidationError as e:
+            errors[field] = _errors(e)
+    return (None, errors) if errors else (cleaned, None)
+
+
+def validate_rows(rows):
+    """Validate a batch in one pass; returns ([(index, cleaned)], {index: errors})."""
+    valid, errors = [], {}
+    for index, row in enumerate(rows):
+        cleaned, row_errors = validate_row(row)
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            valid.append((index, cleaned))
+    return valid, errors
@@ -1,18 +1,29 @@
 from django import forms
-from django.db.models import Q
 from django.core.validators import RegexValidator
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login as auth_login
-from django.http import HttpResponseForbidden
-from django.core.exceptions import PermissionDenied
-from .models import Task
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.views.decorators.http import require_POST
+from django.core.exceptions import PermissionDenied, BadRequest
+from core.logs import Lazy
+from .models import AuditLog, Task
 from .forms import TaskForm
+from .pagination import paginate, InvalidCursor, KeysetPage
+from .search import get_search_backend
+from .stats import get_task_stats
+from .agenda import agenda_sections
+from . import bulk, export, fragment_cache, rbac, trash
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+TRASH_PAGE_SIZE = 100  # most recently deleted tasks shown in the trash
+
 # Username whitelisting
 class CustomUserCreationForm(UserCreationForm):
     username = forms.CharField(
@@ -31,7 +42,8 @@ def register(request):
             auth_login(request, user)
             return redirect('login_success_redirect')
         else:
-            logger.warning(f"Registration failed: {form.errors.as_json()}")
+            # Rendered by the logging thread, and only if the record is kept (core/logs.py)
+            logger.warning("Registration failed: %s", Lazy(form.errors.as_json), extra={'event': 'registration_failed'})
     else:
         form = CustomUserCreationForm()
     return render(request, 'register.html', {'form': form})
@@ -44,16 +56,30 @@ def task_list(request):
         return redirect('admin:index')
 
     query = request.GET.get('q', '')
-    # IDOR Prevention: Always start by filtering by the current user
-    tasks = Task.objects.filter(owner=request.user)
-
-    if query:
-        # Parameterized 
-        tasks = tasks.filter(
-            Q(title__icontains=query) | Q(description__icontains=query)
-        )
-    
-    return render(request, 'tasks/task_list.html', {'tasks': tasks, 'query': query})
+    cursor = request.GET.get('cursor')
+
+    def render_table():
+        # IDOR Prevention: Always start by filtering by the current user
+        tasks = Task.objects.filter(owner=request.user).for_list()
+
+        if query:
+            # Parameterized, index-backed full-text search, best matches
+            # first; a search is a single page (see tasks/search.py)
+            page = KeysetPage(get_search_backend().search(tasks, query), None, None)
+        else:
+            # Keyset pagination: never render the whole task set at once
+            try:
+                page = paginate(tasks, cursor=cursor)
+            except InvalidCursor:
+                raise BadRequest("Invalid page cursor.")
+        return render_to_string('tasks/task_table.html', {'page': page, 'query': query})
+
+    # The rendered table is cached per user and query (see tasks/fragment_cache.py)
+    task_table = fragment_cache.get_or_render(request.user.pk, {'q': query, 'cursor': cursor}, render_table)
+
+    return render(request, 'tasks/task_list.html', {
+        'task_table': task_table, 'query': query, 'stats': get_task_stats(request.user.pk),
+    })
 
 # 2. CREATE: Add new task (Input Validation via Forms)
 @login_required
@@ -73,12 +99,10 @@ def create_task(request):
 @login_required
 def edit_task(request, pk):
     # IDOR Prevention: Use a filtered queryset to ensure users can only access their own tasks
-    if request.user.has_perm('tasks.change_task'):
-        task = get_object_or_404(Task, pk=pk)
-    else:
-        # Ensure users can only retrieve tasks they own
-        task = get_object_or_404(Task, pk=pk, owner=request.user)
-    
+    # (or every task, with the global change permission; see tasks/rbac.py)
+    task = get_object_or_404(rbac.editable_tasks(request.user), pk=pk)
+
+
     if request.method == "POST":
         form = TaskForm(request.POST, instance=task)
         if form.is_valid():
@@ -94,23 +118,98 @@ def delete_task(request, pk):
     task = get_object_or_404(Task, pk=pk)
     
     # Granular RBAC: Check if user is owner OR has the global delete permission
-    if not (task.owner == request.user or request.user.has_perm('tasks.delete_task')):
+    if not rbac.can_delete(request.user, task):
         raise PermissionDenied
     
     if request.method == "POST":
-        task.delete()
+        # Soft delete: restorable from the trash until purge_tasks removes it
+        trash.move_to_trash(Task.objects.filter(pk=task.pk))
         return redirect('task_list')
     return render(request, 'tasks/task_confirm_delete.html', {'task': task})
 
+# 5. BULK: Complete, reopen, delete or create many tasks in one request
+@login_required
+@require_POST
+def bulk_tasks(request):
+    try:
+        payload = json.loads(request.body)
+        action = payload['action']
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse({'error': "Expected a JSON object with an 'action'."}, status=400)
+
+    items = payload.get('tasks' if action == 'create' else 'ids')
+    if not isinstance(items, list) or not items:
+        return JsonResponse({'error': "Expected a non-empty list of 'ids' or 'tasks'."}, status=400)
+    if len(items) > bulk.MAX_BULK_ITEMS:
+        return JsonResponse({'error': f"At most {bulk.MAX_BULK_ITEMS} items per request."}, status=400)
+    if action != 'create' and not all(type(pk) is int for pk in items):
+        return JsonResponse({'error': "Task ids must be integers."}, status=400)
+
+    if action in ('complete', 'reopen'):
+        count = bulk.set_completed(request.user, items, action == 'complete')
+    elif action == 'delete':
+        count = bulk.delete(request.user, items)
+    elif action == 'create':
+        created, errors = bulk.create(request.user, items)
+        if errors:
+            return JsonResponse({'errors': errors}, status=400)
+        return JsonResponse({'action': action, 'count': len(created), 'ids': [task.pk for task in created]}, status=201)
+    else:
+        return JsonResponse({'error': f"Unknown action '{action}'."}, status=400)
+    return JsonResponse({'action': action, 'count': count})
+
+# 6. EXPORT: Stream tasks as CSV or JSONL (see tasks/export.py)
+@login_required
+def export_tasks(request, fmt):
+    if fmt not in export.FORMATS:
+        raise Http404
+    # Staff may export every user's tasks; everyone else only their own
+    if request.GET.get('scope') == 'all':
+        if not request.user.is_staff:
+            raise PermissionDenied
+        return export.streaming_export(Task.objects.all(), export.TASK_FIELDS + ('owner__username',), fmt, 'tasks-all')
+    return export.streaming_export(Task.objects.filter(owner=request.user), export.TASK_FIELDS, fmt, 'tasks')
+
+@staff_member_required
+def export_auditlog(request, fmt):
+    if fmt not in export.FORMATS:
+        raise Http404
+    return export.streaming_export(AuditLog.objects.all(), export.AUDIT_FIELDS, fmt, 'auditlog')
+
 # 7. Conditional Redirect after Login
 @login_required
 def login_success_redirect(request):
     if request.user.is_staff:
-        logger.info(f"Admin login detected: Redirecting {request.user.username} to Admin Panel.")
+        logger.info("Admin login detected: Redirecting %s to Admin Panel.", request.user.username)
         return redirect('admin:index')
-    logger.info(f"Regular login detected: Redirecting {request.user.username} to Task List.")
+    logger.info("Regular login detected: Redirecting %s to Task List.", request.user.username)
     return redirect('task_list')
 
+# 8. AGENDA: Open tasks that are overdue, due today and due this week (see tasks/agenda.py)
+@login_required
+def agenda(request):
+    if request.user.is_staff:
+        return redirect('admin:index')
+    return render(request, 'tasks/task_agenda.html', {'sections': agenda_sections(request.user.pk)})
+
+# 9. TRASH: Deleted tasks, restorable until purged (see tasks/trash.py)
+@login_required
+def task_trash(request):
+    if request.user.is_staff:
+        return redirect('admin:index')
+    tasks = (
+        Task.all_objects.trashed().filter(owner=request.user).for_list()
+        .order_by('-deleted_at', '-id')[:TRASH_PAGE_SIZE]
+    )
+    return render(request, 'tasks/task_trash.html', {'tasks': tasks, 'retention_days': trash.retention().days})
+
+@login_required
+@require_POST
+def restore_task(request, pk):
+    if not trash.restore(rbac.restorable_tasks(request.user).filter(pk=pk)):
+        raise Http404
+    return redirect('task_trash')
+
 def custom_400(request, exception=None):
     return render(request, '400.html', status=400)
 
@@ -125,4 +224,4 @@ def custom_500(request):
 
 @login_required
 def profile(request):
-    return render(request, 'profile.html')
\ No newline at end of file
+    return render(request, 'profile.html', {'stats': get_task_stats(request.user.pk)})
\ No newline at end of file